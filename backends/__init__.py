@@ -0,0 +1,44 @@
+"""Pluggable input and clock backends"""
+import contextlib
+from backends.clock import SystemClock
+
+_input_backend = None
+_clock = SystemClock()
+
+
+def get_input_backend():
+    """Return the active input backend, creating the pyautogui backend on first use"""
+    global _input_backend
+    if _input_backend is None:
+        from backends.input import PyAutoGUIBackend
+        _input_backend = PyAutoGUIBackend()
+    return _input_backend
+
+
+def set_input_backend(backend):
+    """Replace the active input backend (e.g. with a simulator backend)"""
+    global _input_backend
+    _input_backend = backend
+
+
+def get_clock():
+    """Return the active clock"""
+    return _clock
+
+
+def set_clock(clock):
+    """Replace the active clock (e.g. with a VirtualClock)"""
+    global _clock
+    _clock = clock
+
+
+@contextlib.contextmanager
+def use_backends(input_backend, clock):
+    """Temporarily install an input backend and clock"""
+    global _input_backend, _clock
+    previous = (_input_backend, _clock)
+    _input_backend, _clock = input_backend, clock
+    try:
+        yield
+    finally:
+        _input_backend, _clock = previous
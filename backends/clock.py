@@ -0,0 +1,26 @@
+"""Clock backends"""
+import time
+
+
+class SystemClock:
+    """Wall-clock time using time.monotonic and time.sleep"""
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """Simulated clock where sleeping advances time instantly"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.now += seconds
@@ -0,0 +1,77 @@
+"""Input and screen capture backends"""
+
+
+class InputBackend:
+    """
+    Interface for mouse, keyboard and screen capture
+
+    pyautogui bundles input and screenshots, so backends provide both.
+    """
+
+    def move_to(self, x, y, duration=0.0):
+        """Move cursor to screen coordinates over duration seconds"""
+        raise NotImplementedError("Subclasses must implement move_to()")
+
+    def click(self):
+        """Click at the current cursor position"""
+        raise NotImplementedError("Subclasses must implement click()")
+
+    def key_down(self, key):
+        """Press and hold key"""
+        raise NotImplementedError("Subclasses must implement key_down()")
+
+    def key_up(self, key):
+        """Release key"""
+        raise NotImplementedError("Subclasses must implement key_up()")
+
+    def position(self):
+        """Return current cursor position as (x, y)"""
+        raise NotImplementedError("Subclasses must implement position()")
+
+    def size(self):
+        """Return screen size as (width, height)"""
+        raise NotImplementedError("Subclasses must implement size()")
+
+    def screenshot(self, region=None):
+        """
+        Capture screen contents
+
+        Args:
+            region: tuple of (x, y, width, height), or None for the full screen
+
+        Returns:
+            RGB image (PIL image or numpy array)
+        """
+        raise NotImplementedError("Subclasses must implement screenshot()")
+
+
+class PyAutoGUIBackend(InputBackend):
+    """Input backend driving the real mouse, keyboard and screen"""
+
+    def __init__(self):
+        # Imported here since pyautogui needs a display at import time
+        import pyautogui
+        self.pyautogui = pyautogui
+
+    def move_to(self, x, y, duration=0.0):
+        self.pyautogui.moveTo(x, y, duration=duration)
+
+    def click(self):
+        self.pyautogui.click()
+
+    def key_down(self, key):
+        self.pyautogui.keyDown(key)
+
+    def key_up(self, key):
+        self.pyautogui.keyUp(key)
+
+    def position(self):
+        x, y = self.pyautogui.position()
+        return int(x), int(y)
+
+    def size(self):
+        width, height = self.pyautogui.size()
+        return int(width), int(height)
+
+    def screenshot(self, region=None):
+        return self.pyautogui.screenshot(region=region)
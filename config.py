@@ -11,12 +11,60 @@ class ScreenConfig:
     def get_region(cls):
         return (cls.REGION_X, cls.REGION_Y, cls.REGION_WIDTH, cls.REGION_HEIGHT)
 
+    @classmethod
+    def set_region(cls, x, y, width, height):
+        """Update the capture region (used by the window locator)"""
+        cls.REGION_X = int(x)
+        cls.REGION_Y = int(y)
+        cls.REGION_WIDTH = int(width)
+        cls.REGION_HEIGHT = int(height)
+
     @classmethod
     def to_screen_coords(cls, x, y):
         """Convert region coordinates to screen coordinates"""
         return x + cls.REGION_X, y + cls.REGION_Y
 
 
+class WindowLocatorConfig:
+    """Automatic game window localization settings"""
+    ENABLED = True
+
+    # Image cropped from the top-left corner of the game viewport
+    TEMPLATE_PATH = 'templates/viewport_anchor.png'
+
+    # Offset from the template's top-left corner to the capture region origin
+    # (in template pixels, scaled with the match)
+    REGION_OFFSET = (0, 0)
+
+    # Template scales tried during the full-screen search
+    SCALES = (0.75, 0.875, 1.0, 1.125, 1.25, 1.5)
+    MATCH_THRESHOLD = 0.6
+
+    # Match Canny edges instead of raw pixels (robust to lighting changes)
+    USE_EDGES = True
+    CANNY_THRESHOLDS = (50, 150)
+
+    # Coarse search runs on a downscaled screen, then refines at full size
+    SEARCH_DOWNSCALE = 0.5
+    REFINE_MARGIN = 16
+
+    # Number of best coarse matches (across scales) refined at full size
+    REFINE_CANDIDATES = 3
+
+    # Located regions are cached per screen resolution
+    CACHE_FILE = '.window_cache.json'
+
+    # Anchor re-validation (a few pixels at the template location), at most
+    # once per REVALIDATE_INTERVAL seconds
+    REVALIDATE_INTERVAL = 5.0
+    ANCHOR_SIZE = 4
+    ANCHOR_TOLERANCE = 12
+
+    # Backoff (seconds) between searches while the window cannot be found
+    RETRY_INITIAL_DELAY = 5.0
+    RETRY_MAX_DELAY = 120.0
+
+
 class WispDetectionConfig:
     """Configuration for wisp detection"""
     # HSV color ranges for cyan/blue-green wisps
@@ -33,6 +81,35 @@ class WispDetectionConfig:
     # Morphology kernel size
     MORPH_KERNEL_SIZE = (3, 3)
 
+    # Square region (pixels) re-checked around a stale target before clicking
+    REVERIFY_ROI_SIZE = 120
+
+
+class ScoringConfig:
+    """Cost model used to pick which wisp to click"""
+    # Use the cost model instead of picking the largest blob
+    ENABLED = True
+
+    # Player position as a fraction of the capture region (character is centered)
+    PLAYER_POSITION = (0.5, 0.5)
+
+    # Cost weights; distances are normalized by the region diagonal, size by
+    # WispDetectionConfig.MAX_AREA and stability by STABILITY_FRAMES
+    PLAYER_DISTANCE_WEIGHT = 1.0
+    CURSOR_DISTANCE_WEIGHT = 0.5
+    SIZE_WEIGHT = 0.3
+    STABILITY_WEIGHT = 0.2
+
+    # Candidates within this many pixels of one in the previous frame are the same target
+    STABILITY_RADIUS = 20
+    STABILITY_FRAMES = 5
+
+    # Sightings only count as consecutive if frames are at most this many seconds apart
+    STABILITY_MAX_GAP = 0.5
+
+    # Number of ranked candidates marked in the debug overlay and live preview
+    TOP_K = 3
+
 
 class RiftDetectionConfig:
     """Configuration for energy rift detection"""
@@ -49,6 +126,9 @@ class RiftDetectionConfig:
     CLOSE_KERNEL_SIZE = (15, 15)
     OPEN_KERNEL_SIZE = (5, 5)
 
+    # Square region (pixels) re-checked around a stale target before clicking
+    REVERIFY_ROI_SIZE = 300
+
 
 class BotConfig:
     """Bot behavior configuration"""
@@ -64,6 +144,15 @@ class BotConfig:
     MIN_CLICK_DURATION = 0.3
     MAX_CLICK_DURATION = 0.7
 
+    # Re-verify the target on a fresh capture if the detection is older
+    # than MAX_TARGET_AGE seconds when the cursor arrives
+    REVERIFY_STALE_TARGETS = True
+    MAX_TARGET_AGE = 0.5
+    CORRECTION_DURATION = 0.1
+
+    # Number of per-action latency records kept in memory
+    LATENCY_HISTORY = 1000
+
     # Harvests before rift conversion
     INITIAL_HARVESTS_BEFORE_RIFT = 2
     SUBSEQUENT_HARVESTS_BEFORE_RIFT = 1
@@ -74,6 +163,21 @@ class BotConfig:
     DELAY_WHEN_NO_WISP = 1.0
 
 
+class PipelineConfig:
+    """Pipelined capture and detection settings"""
+    # Run capture and detection on background threads (BotController)
+    ENABLED = False
+
+    # Capture rate limit; 0 captures as fast as possible
+    MAX_CAPTURE_FPS = 30
+
+    # Detection threads, each with its own detector instances
+    DETECTION_WORKERS = 2
+
+    # Seconds to wait for a fresh detection result before giving up
+    RESULT_TIMEOUT = 2.0
+
+
 class CameraConfig:
     """Camera rotation configuration"""
     MIN_ROTATION_DURATION = 0.5
@@ -82,9 +186,100 @@ class CameraConfig:
     DIRECTIONS = ['left', 'right', 'up', 'down']
 
 
+class SimulatorConfig:
+    """Headless game simulator settings"""
+    SCREEN_SIZE = (1280, 800)
+    SEED = 0
+
+    # Colors (BGR) chosen to fall inside the detection HSV ranges
+    BACKGROUND_COLOR = (35, 45, 40)
+    VIEWPORT_COLOR = (45, 60, 50)
+    WISP_COLOR = (255, 200, 0)
+    RIFT_COLOR = (0, 255, 130)
+    DECOY_COLOR = (30, 90, 60)
+
+    # Camera: horizontal field of view and yaw speed while an arrow key is held
+    FOV_DEGREES = 90
+    YAW_SPEED = 60
+
+    # Wisps drift around the player and respawn after being harvested
+    NUM_WISPS = 5
+    WISP_RADIUS = 10
+    WISP_DRIFT_SPEED = 4
+    WISP_BOB_AMPLITUDE = 0.03
+    WISP_RESPAWN_TIME = 10
+
+    RIFT_AZIMUTH = 180
+    RIFT_RADIUS = 45
+    NUM_DECOYS = 6
+
+    # Extra pixels around an object that still count as a hit
+    CLICK_TOLERANCE = 3
+
+    # Frame stepping for detector-only runs (soak, scoring evaluation):
+    # virtual seconds between frames and camera yaw change per frame
+    FRAME_INTERVAL = 0.1
+    YAW_STEP = 7
+
+
+class SoakConfig:
+    """Long-run soak test settings"""
+    ITERATIONS = 1000000
+    SAMPLE_EVERY = 10000
+
+    # Samples skipped before the baseline is taken (caches, allocator warm-up)
+    WARMUP_SAMPLES = 2
+
+    # tracemalloc adds overhead but reports the top allocating lines
+    TRACEMALLOC = True
+    TRACEMALLOC_FRAMES = 1
+    TRACEMALLOC_TOP = 5
+
+    # Failure bounds relative to the baseline sample
+    MAX_RSS_GROWTH_MB = 50
+    MAX_P99_DRIFT_RATIO = 1.5
+
+    # p99 drift below this many milliseconds is timer noise on sub-ms stages
+    MIN_P99_DRIFT_MS = 0.5
+
+    OUTPUT_FILE = 'soak-results.jsonl'
+
+
+class PreviewConfig:
+    """Live debug preview server settings"""
+    # Drawing and encoding only happen while a browser is connected
+    ENABLED = True
+    HOST = '127.0.0.1'
+    PORT = 8765
+    MAX_FPS = 5
+    JPEG_QUALITY = 70
+
+
+class StartupConfig:
+    """Startup time budget check settings"""
+    # Entry point name -> (module, untimed setup and initializer as
+    # 'module:callable' or None, import + initialization budget in seconds).
+    # The bot is measured up to its first detection on a window cache hit.
+    ENTRY_POINTS = {
+        'bot': ('main', 'utils.startup_check:prepare_window_cache',
+                'utils.startup_check:first_detection_from_cache', 1.0),
+        'simulator': ('simulator.run', None, 'simulator.scene:SimulatedGame', 0.5),
+        'soak': ('simulator.soak', None, None, 0.5),
+        'evaluate_scoring': ('simulator.evaluate_scoring', None, None, 0.5)
+    }
+
+    # Modules that must not be loaded at startup (pyautogui needs a display)
+    FORBIDDEN_MODULES = ('pyautogui',)
+
+    # Each entry point is measured in RUNS fresh interpreters; the fastest counts
+    RUNS = 3
+    REPORT_TOP = 8
+
+
 class DebugConfig:
     """Debug output configuration"""
-    ENABLED = True
+    # Write debug PNGs on every detection (prefer the live preview)
+    ENABLED = False
     DEBUG_DIR = 'debug-screenshots'
 
     # File names for debug output
@@ -1,11 +1,19 @@
 """Main bot controller"""
-import pyautogui
-import time
 import random
+from backends import get_input_backend, get_clock
 from detectors.wisp_detector import WispDetector
 from detectors.rift_detector import RiftDetector
+from detectors.pipeline import DetectionPipeline
 from controllers.camera import CameraController
-from config import BotConfig
+from utils.window_locator import WindowLocator
+from utils.latency import LatencyTracker, format_record
+from utils.preview_server import start_preview_server, stop_preview_server
+from config import BotConfig, PipelineConfig, PreviewConfig
+
+
+# Returned by _detect when the pipeline produced no fresh result in time;
+# unlike None it does not mean the target is not visible
+NO_RESULT = object()
 
 
 class BotController:
@@ -15,26 +23,99 @@ class BotController:
         self.wisp_detector = WispDetector()
         self.rift_detector = RiftDetector()
         self.camera = CameraController()
+        self.window_locator = WindowLocator()
+        self.latency = LatencyTracker(BotConfig.LATENCY_HISTORY)
+        self.pipeline = None
         self.wisp_harvest_count = 0
         self.max_harvests_before_rift = BotConfig.INITIAL_HARVESTS_BEFORE_RIFT
 
-    def _harvest_wisp(self, x, y):
+    def _detect(self, kind):
         """
-        Click and harvest a wisp
+        Detect a target, using the background pipeline when enabled
+
+        In pipelined mode this waits for a result from a frame captured
+        after the call, so it never acts on a frame from before the last
+        action.
+
+        Args:
+            kind: 'wisp' or 'rift'
+
+        Returns:
+            Detection, None if nothing was detected, or NO_RESULT if the
+            pipeline produced no fresh result within RESULT_TIMEOUT
+        """
+        if self.pipeline is None:
+            detector = self.wisp_detector if kind == 'wisp' else self.rift_detector
+            return detector.detect()
+
+        result = self.pipeline.wait_for_result(kind)
+        if result is None:
+            print(f"No {kind} detection result within {PipelineConfig.RESULT_TIMEOUT}s, retrying")
+            return NO_RESULT
+
+        _, detection = result
+        return detection
+
+    def _click_target(self, detection, detector):
+        """
+        Move to a detected target and click it
+
+        If the detection is older than MAX_TARGET_AGE when the cursor
+        arrives, the target is re-verified on a fresh capture first.
 
         Args:
-            x: screen x coordinate
-            y: screen y coordinate
+            detection: Detection to click
+            detector: detector used to re-verify the target
+
+        Returns:
+            True if the click was performed
         """
-        # Random click duration 
+        # Random click duration
         click_duration = random.uniform(
             BotConfig.MIN_CLICK_DURATION,
             BotConfig.MAX_CLICK_DURATION
         )
-        print(f"Clicking wisp at ({x}, {y}) with {click_duration:.2f}s movement")
+        print(f"Clicking {detection.kind} at ({detection.x}, {detection.y}) with {click_duration:.2f}s movement")
+
+        input_backend = get_input_backend()
+        clock = get_clock()
+
+        input_start = clock.monotonic()
+        input_backend.move_to(detection.x, detection.y, duration=click_duration)
+
+        reverified = False
+        age = clock.monotonic() - detection.captured_at
+        if BotConfig.REVERIFY_STALE_TARGETS and age > BotConfig.MAX_TARGET_AGE:
+            reverified = True
+            fresh = detector.verify(detection)
+
+            if fresh is None:
+                print(f"Target {detection.kind} gone after {age:.2f}s, skipping click")
+                self.latency.record(detection, input_start, clock.monotonic(), reverified, clicked=False)
+                return False
+
+            if (fresh.x, fresh.y) != (detection.x, detection.y):
+                print(f"Target moved to ({fresh.x}, {fresh.y}), correcting")
+                input_backend.move_to(fresh.x, fresh.y, duration=BotConfig.CORRECTION_DURATION)
 
-        pyautogui.moveTo(x, y, duration=click_duration)
-        pyautogui.click()
+        input_backend.click()
+
+        # The view changes after acting; stability history no longer applies
+        self.wisp_detector.scorer.reset()
+
+        record = self.latency.record(detection, input_start, clock.monotonic(), reverified)
+        print(format_record(record))
+        return True
+
+    def _harvest_wisp(self, detection):
+        """
+        Click and harvest a wisp
+
+        Args:
+            detection: wisp Detection in screen coordinates
+        """
+        if not self._click_target(detection, self.wisp_detector):
+            return
 
         # Random harvest time
         harvest_time = random.uniform(
@@ -43,28 +124,23 @@ class BotController:
         )
         print(f"Harvesting for {harvest_time:.1f} seconds...")
 
-        time.sleep(harvest_time)
+        get_clock().sleep(harvest_time)
 
         self.wisp_harvest_count += 1
         print(f"Completed harvest #{self.wisp_harvest_count}")
 
-    def _convert_at_rift(self, x, y):
+    def _convert_at_rift(self, detection):
         """
         Click and convert memories at energy rift
 
         Args:
-            x: screen x coordinate
-            y: screen y coordinate
-        """
-        # Random click duration
-        click_duration = random.uniform(
-            BotConfig.MIN_CLICK_DURATION,
-            BotConfig.MAX_CLICK_DURATION
-        )
-        print(f"Clicking energy rift at ({x}, {y})")
+            detection: rift Detection in screen coordinates
 
-        pyautogui.moveTo(x, y, duration=click_duration)
-        pyautogui.click()
+        Returns:
+            True if the rift was clicked
+        """
+        if not self._click_target(detection, self.rift_detector):
+            return False
 
         # Random conversion time
         convert_time = random.uniform(
@@ -73,53 +149,110 @@ class BotController:
         )
         print(f"Converting memories for {convert_time:.1f} seconds...")
 
-        time.sleep(convert_time)
+        get_clock().sleep(convert_time)
 
         # Reset counter for next cycle
         self.wisp_harvest_count = 0
         self.max_harvests_before_rift = BotConfig.SUBSEQUENT_HARVESTS_BEFORE_RIFT
         print(f"Next rift visit after {self.max_harvests_before_rift} harvest")
+        return True
+
+    def _rotate_camera(self):
+        """Rotate the camera and forget target stability history"""
+        self.camera.rotate()
+        self.wisp_detector.scorer.reset()
 
     def _handle_no_wisp(self):
         """Handle case when no wisp is found"""
         print("No wisps found, rotating camera...")
-        self.camera.rotate()
-        time.sleep(BotConfig.DELAY_WHEN_NO_WISP)
+        self._rotate_camera()
+        get_clock().sleep(BotConfig.DELAY_WHEN_NO_WISP)
 
     def _handle_rift_search(self):
         """Search for and click energy rift with retries"""
         print(f"Time to convert at rift (after {self.wisp_harvest_count} harvests)")
 
-        for attempt in range(BotConfig.MAX_RIFT_ATTEMPTS):
+        attempt = 0
+        while attempt < BotConfig.MAX_RIFT_ATTEMPTS:
             print(f"Looking for energy rift (attempt {attempt + 1}/{BotConfig.MAX_RIFT_ATTEMPTS})...")
-            rift_result = self.rift_detector.detect()
+            self.window_locator.tick()
+            rift_result = self._detect('rift')
+
+            # No fresh result is not a miss: retry without rotating or using an attempt
+            if rift_result is NO_RESULT:
+                continue
+            attempt += 1
 
             if rift_result:
-                _, rift_x, rift_y = rift_result
-                self._convert_at_rift(rift_x, rift_y)
-                return True
+                # Rift may have vanished before the click; retry detection
+                if self._convert_at_rift(rift_result):
+                    return True
             else:
                 print("Energy rift not found, rotating camera...")
-                self.camera.rotate()
-                time.sleep(BotConfig.DELAY_AFTER_ROTATION)
+                self._rotate_camera()
+                get_clock().sleep(BotConfig.DELAY_AFTER_ROTATION)
 
         print(f"WARNING: Could not find energy rift after {BotConfig.MAX_RIFT_ATTEMPTS} attempts!")
         print("Continuing with wisp harvesting...")
         return False
 
-    def run(self):
-        """Main bot loop"""
+    def _print_latency_summary(self):
+        """Print latency percentiles over recorded actions"""
+        summary = self.latency.summary()
+        skipped = self.latency.skipped_count()
+        if skipped:
+            print(f"Skipped {skipped} clicks on targets gone after re-verification")
+        if not summary:
+            return
+
+        print(f"Latency over {len(self.latency.clicked_records())} clicks (ms):")
+        for stage, stats in summary.items():
+            print(f"  {stage}: mean {stats['mean'] * 1000:.0f}, p50 {stats['p50'] * 1000:.0f}, "
+                  f"p95 {stats['p95'] * 1000:.0f}, max {stats['max'] * 1000:.0f}")
+
+    def run(self, duration=None):
+        """
+        Main bot loop
+
+        Args:
+            duration: stop after this many seconds of the active clock,
+                      or None to run until interrupted
+        """
         print("Starting Divination bot...")
         print("Press Ctrl+C to stop")
 
+        # Find the game window before the first detection
+        self.window_locator.locate()
+
+        if PreviewConfig.ENABLED:
+            try:
+                start_preview_server()
+            except OSError as e:
+                print(f"Could not start live preview: {e}")
+
+        if PipelineConfig.ENABLED:
+            # Workers share one scorer so stability history follows frame order
+            self.pipeline = DetectionPipeline({
+                'wisp': lambda: WispDetector(self.wisp_detector.scorer),
+                'rift': RiftDetector
+            })
+            self.pipeline.start()
+
+        clock = get_clock()
+        start = clock.monotonic()
+
         try:
-            while True:
+            while duration is None or clock.monotonic() - start < duration:
+                # Cheap check that the game window has not moved (time based)
+                self.window_locator.tick()
+
                 # Look for wisps
-                result = self.wisp_detector.detect()
+                result = self._detect('wisp')
+                if result is NO_RESULT:
+                    continue
 
-                if result and result[0] == 'wisp':
-                    _, x, y = result
-                    self._harvest_wisp(x, y)
+                if result and result.kind == 'wisp':
+                    self._harvest_wisp(result)
 
                     # Check if it's time to convert at rift
                     if self.wisp_harvest_count >= self.max_harvests_before_rift:
@@ -129,3 +262,10 @@ class BotController:
 
         except KeyboardInterrupt:
             print(f"\nBot stopped. Total harvests completed: {self.wisp_harvest_count}")
+        finally:
+            if self.pipeline is not None:
+                self.pipeline.stop()
+                self.pipeline = None
+            stop_preview_server()
+
+        self._print_latency_summary()
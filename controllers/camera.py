@@ -1,7 +1,6 @@
 """Camera control"""
-import pyautogui
-import time
 import random
+from backends import get_input_backend, get_clock
 from config import CameraConfig
 
 
@@ -30,10 +29,13 @@ class CameraController:
 
         print(f"Rotating camera {direction} for {duration:.1f} seconds...")
 
+        input_backend = get_input_backend()
+        clock = get_clock()
+
         # Press and hold arrow key
-        pyautogui.keyDown(direction)
-        time.sleep(duration)
-        pyautogui.keyUp(direction)
+        input_backend.key_down(direction)
+        clock.sleep(duration)
+        input_backend.key_up(direction)
 
         # Small delay after rotation
-        time.sleep(CameraConfig.DELAY_AFTER_ROTATION)
+        clock.sleep(CameraConfig.DELAY_AFTER_ROTATION)
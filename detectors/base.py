@@ -1,10 +1,19 @@
 """Base detector class with shared functionality"""
+import time
+from collections import namedtuple
 import cv2
-from utils.image_processor import capture_screenshot, create_hsv_mask, apply_morphology, save_debug_image
+from utils.image_processor import capture_frame, create_hsv_mask, apply_morphology, save_debug_image
 from utils.geometry import calculate_contour_properties, get_mean_hsv
+from backends import get_clock
 from config import ScreenConfig, DebugConfig
 
 
+# Detection result in screen coordinates. captured_at is the monotonic time
+# the source frame was captured, detected_at when detection finished, and
+# region the (x, y, width, height) capture region it was detected in.
+Detection = namedtuple('Detection', ['kind', 'x', 'y', 'captured_at', 'detected_at', 'frame_id', 'region'])
+
+
 class BaseDetector:
     """Base class for object detection"""
 
@@ -16,18 +25,44 @@ class BaseDetector:
             detection_config: Configuration class with detection parameters
         """
         self.config = detection_config
+        self.last_frame = None
         self.last_bgr_image = None
         self.last_hsv_image = None
         self.last_mask = None
         self.candidates = []
         self.rejected = []
+        self.ranked = []
+        self.chosen = None
+        self.stage_times = {}
+        self._stage_start = None
+        self.verbose = True
+
+    def _log(self, message):
+        """Print message unless the detector runs quietly (e.g. in a pipeline)"""
+        if self.verbose:
+            print(message)
+
+    def _mark_stage(self, stage):
+        """Record time spent (seconds) since the previous stage mark"""
+        now = time.perf_counter()
+        self.stage_times[stage] = now - self._stage_start
+        self._stage_start = now
+
+    def _capture_and_process(self, frame=None):
+        """
+        Capture screenshot and create HSV mask
+
+        Args:
+            frame: already captured Frame to process, or None to capture one
+        """
+        self.stage_times = {}
+        self._stage_start = time.perf_counter()
 
-    def _capture_and_process(self):
-        """Capture screenshot and create HSV mask"""
         # Capture screenshot
-        self.last_bgr_image, self.last_hsv_image = capture_screenshot(
-            ScreenConfig.get_region()
-        )
+        self.last_frame = frame if frame is not None else capture_frame(ScreenConfig.get_region())
+        self.last_bgr_image = self.last_frame.bgr
+        self.last_hsv_image = self.last_frame.hsv
+        self._mark_stage('capture')
 
         # Create mask
         self.last_mask = create_hsv_mask(
@@ -40,10 +75,10 @@ class BaseDetector:
         """Apply morphological operations to mask"""
         self.last_mask = apply_morphology(self.last_mask, operations)
 
-    def _find_contours(self):
-        """Find contours in mask"""
+    def _find_contours(self, mask=None):
+        """Find contours in mask (defaults to the last mask)"""
         contours, _ = cv2.findContours(
-            self.last_mask,
+            self.last_mask if mask is None else mask,
             cv2.RETR_EXTERNAL,
             cv2.CHAIN_APPROX_SIMPLE
         )
@@ -119,11 +154,90 @@ class BaseDetector:
         self.candidates.sort(key=lambda x: x[sort_key], reverse=True)
         return self.candidates[0]
 
-    def detect(self):
+    def _make_detection(self, kind, candidate):
+        """
+        Build a Detection for a candidate in the last frame
+
+        Args:
+            kind: detection type ('wisp', 'rift')
+            candidate: candidate properties dict
+
+        Returns:
+            Detection in screen coordinates
+        """
+        # Use the region the frame was captured with; ScreenConfig may have
+        # been updated by the window locator since
+        region_x, region_y = self.last_frame.region[:2]
+        screen_x = candidate['center'][0] + region_x
+        screen_y = candidate['center'][1] + region_y
+        return Detection(kind, screen_x, screen_y, self.last_frame.captured_at,
+                         get_clock().monotonic(), self.last_frame.frame_id, self.last_frame.region)
+
+    def _morphology_operations(self):
+        """Morphological operations applied to the mask - to be implemented by subclasses"""
+        raise NotImplementedError("Subclasses must implement _morphology_operations()")
+
+    def _filter_candidate(self, props):
+        """Filter function for candidates - to be implemented by subclasses"""
+        raise NotImplementedError("Subclasses must implement _filter_candidate()")
+
+    def verify(self, detection):
+        """
+        Re-detect a target on a fresh capture of a small region around it
+
+        Only the REVERIFY_ROI_SIZE square around the detection is captured,
+        and detector state (last images, candidates) is left untouched.
+
+        Args:
+            detection: Detection to verify
+
+        Returns:
+            Detection from the fresh frame closest to the original, or None
+        """
+        region_x, region_y, region_w, region_h = detection.region
+        half = self.config.REVERIFY_ROI_SIZE // 2
+
+        # Clip ROI to the region the detection was made in
+        x0 = max(detection.x - half, region_x)
+        y0 = max(detection.y - half, region_y)
+        x1 = min(detection.x + half, region_x + region_w)
+        y1 = min(detection.y + half, region_y + region_h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+
+        frame = capture_frame((x0, y0, x1 - x0, y1 - y0))
+        mask = create_hsv_mask(frame.hsv, self.config.LOWER_HSV, self.config.UPPER_HSV)
+        mask = apply_morphology(mask, self._morphology_operations())
+
+        best = None
+        best_distance = None
+        for contour in self._find_contours(mask):
+            props = {**calculate_contour_properties(contour), **get_mean_hsv(frame.hsv, contour)}
+            is_valid, _ = self._filter_candidate(props)
+            if not is_valid:
+                continue
+
+            screen_x = x0 + props['center'][0]
+            screen_y = y0 + props['center'][1]
+            distance = (screen_x - detection.x) ** 2 + (screen_y - detection.y) ** 2
+            if best is None or distance < best_distance:
+                best = (screen_x, screen_y)
+                best_distance = distance
+
+        if best is None:
+            return None
+
+        return Detection(detection.kind, best[0], best[1], frame.captured_at,
+                         get_clock().monotonic(), frame.frame_id, detection.region)
+
+    def detect(self, frame=None):
         """
         Detect object - to be implemented by subclasses
 
+        Args:
+            frame: already captured Frame to process, or None to capture one
+
         Returns:
-            tuple of (type, x, y) or None
+            Detection or None
         """
         raise NotImplementedError("Subclasses must implement detect()")
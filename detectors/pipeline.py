@@ -0,0 +1,234 @@
+"""Pipelined capture and detection with a latest-frame slot"""
+import threading
+from utils.image_processor import capture_frame
+from backends import get_clock
+from config import ScreenConfig, PipelineConfig
+
+
+class LatestFrameSlot:
+    """
+    Single-slot buffer holding only the newest captured frame
+
+    Producers overwrite the slot, so consumers never see a backlog of stale
+    frames. Each frame is handed to at most one consumer.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.frame = None
+        self.taken_id = 0
+        self.closed = False
+
+    def put(self, frame):
+        """Replace the slot contents with a newer frame"""
+        with self.condition:
+            self.frame = frame
+            self.condition.notify()
+
+    def latest_frame_id(self):
+        """ID of the newest frame put in the slot (0 if none)"""
+        with self.condition:
+            return self.frame.frame_id if self.frame is not None else 0
+
+    def take(self, timeout=None):
+        """
+        Take the newest frame not yet handed to a consumer
+
+        Args:
+            timeout: seconds to wait, or None to wait indefinitely
+
+        Returns:
+            Frame, or None on timeout or when the slot is closed
+        """
+        with self.condition:
+            ready = self.condition.wait_for(
+                lambda: self.closed or (self.frame is not None and self.frame.frame_id > self.taken_id),
+                timeout
+            )
+            if not ready or self.closed:
+                return None
+            self.taken_id = self.frame.frame_id
+            return self.frame
+
+    def close(self):
+        """Wake all waiting consumers and refuse further takes"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class ResultBoard:
+    """Newest detection result per kind, tagged with its source frame ID"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.results = {}
+        self.closed = False
+
+    def publish(self, kind, frame_id, detection):
+        """
+        Publish a detection result (None when nothing was found)
+
+        Results older than the one already published are dropped, since
+        workers may finish frames out of order.
+        """
+        with self.condition:
+            current = self.results.get(kind)
+            if current is not None and current[0] >= frame_id:
+                return
+            self.results[kind] = (frame_id, detection)
+            self.condition.notify_all()
+
+    def wait_newer(self, kind, frame_id, timeout=None):
+        """
+        Block until a result from a frame newer than frame_id is published
+
+        Args:
+            kind: detection type ('wisp', 'rift')
+            frame_id: only results from frames with a greater ID are returned
+            timeout: seconds to wait, or None to wait indefinitely
+
+        Returns:
+            tuple of (frame_id, Detection or None), or None on timeout
+        """
+        with self.condition:
+            ready = self.condition.wait_for(
+                lambda: self.closed or self.results.get(kind, (0, None))[0] > frame_id,
+                timeout
+            )
+            if not ready or self.closed:
+                return None
+            return self.results[kind]
+
+    def close(self):
+        """Wake all waiters"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class DetectionPipeline:
+    """
+    Capture thread feeding detection threads through a latest-frame slot
+
+    OpenCV and NumPy release the GIL for most of their work, so capture,
+    color conversion and detection of consecutive frames overlap.
+    """
+
+    def __init__(self, detector_factories, workers=None):
+        """
+        Initialize pipeline
+
+        Args:
+            detector_factories: dict of kind -> callable returning a detector;
+                                every worker builds its own instances
+            workers: number of detection threads (default: PipelineConfig.DETECTION_WORKERS)
+        """
+        self.detector_factories = detector_factories
+        self.worker_count = workers or PipelineConfig.DETECTION_WORKERS
+        self.slot = LatestFrameSlot()
+        self.board = ResultBoard()
+        self.threads = []
+        self.running = threading.Event()
+        self.error = None
+
+    def _capture_loop(self):
+        """Continuously capture frames into the slot"""
+        interval = 1.0 / PipelineConfig.MAX_CAPTURE_FPS if PipelineConfig.MAX_CAPTURE_FPS else 0.0
+        clock = get_clock()
+        while self.running.is_set():
+            start = clock.monotonic()
+            try:
+                self.slot.put(capture_frame(ScreenConfig.get_region()))
+            except Exception as e:
+                self.error = e
+                self.stop()
+                return
+
+            remaining = interval - (clock.monotonic() - start)
+            if remaining > 0:
+                clock.sleep(remaining)
+
+    def _detection_loop(self):
+        """Run all detectors on each frame taken from the slot"""
+        detectors = {}
+        for kind, factory in self.detector_factories.items():
+            detectors[kind] = factory()
+            detectors[kind].verbose = False
+
+        while self.running.is_set():
+            frame = self.slot.take(timeout=0.5)
+            if frame is None:
+                continue
+
+            for kind, detector in detectors.items():
+                try:
+                    detection = detector.detect(frame)
+                except Exception as e:
+                    self.error = e
+                    self.stop()
+                    return
+                self.board.publish(kind, frame.frame_id, detection)
+
+    def start(self):
+        """Start capture and detection threads"""
+        if self.running.is_set():
+            return
+
+        self.running.set()
+        self.threads = [threading.Thread(target=self._capture_loop, name='capture', daemon=True)]
+        for i in range(self.worker_count):
+            self.threads.append(
+                threading.Thread(target=self._detection_loop, name=f'detect-{i}', daemon=True)
+            )
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        """Stop all threads and wake any waiting callers"""
+        self.running.clear()
+        self.slot.close()
+        self.board.close()
+
+        current = threading.current_thread()
+        for thread in self.threads:
+            if thread is not current:
+                thread.join(timeout=2.0)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def latest_frame_id(self):
+        """ID of the newest captured frame (0 if none)"""
+        return self.slot.latest_frame_id()
+
+    def wait_for_result(self, kind, newer_than=None, timeout=None):
+        """
+        Wait for a detection result from a frame newer than a given ID
+
+        Args:
+            kind: detection type ('wisp', 'rift')
+            newer_than: frame ID the result must be newer than; defaults to
+                        the newest frame captured so far, so the result
+                        comes from a frame captured after this call
+            timeout: seconds to wait (default: PipelineConfig.RESULT_TIMEOUT)
+
+        Returns:
+            tuple of (frame_id, Detection or None), or None on timeout
+
+        Raises:
+            RuntimeError: if a pipeline thread failed
+        """
+        if newer_than is None:
+            newer_than = self.latest_frame_id()
+        if timeout is None:
+            timeout = PipelineConfig.RESULT_TIMEOUT
+
+        result = self.board.wait_newer(kind, newer_than, timeout)
+        if self.error is not None:
+            raise RuntimeError(f"Detection pipeline failed: {self.error}") from self.error
+        return result
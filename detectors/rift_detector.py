@@ -1,7 +1,8 @@
 """Energy rift detection"""
 from detectors.base import BaseDetector
-from utils.image_processor import draw_detections, save_debug_image
-from config import RiftDetectionConfig, ScreenConfig, DebugConfig
+from utils.image_processor import draw_detections, draw_ranking, save_debug_image
+from utils.preview_server import publish_preview
+from config import RiftDetectionConfig, DebugConfig
 import cv2
 
 
@@ -11,7 +12,14 @@ class RiftDetector(BaseDetector):
     def __init__(self):
         super().__init__(RiftDetectionConfig)
 
-    def _filter_rift(self, props):
+    def _morphology_operations(self):
+        """Morphological operations used to clean the rift mask"""
+        return [
+            ('close', RiftDetectionConfig.CLOSE_KERNEL_SIZE),
+            ('open', RiftDetectionConfig.OPEN_KERNEL_SIZE)
+        ]
+
+    def _filter_candidate(self, props):
         """
         Filter function for rift candidates
 
@@ -37,15 +45,24 @@ class RiftDetector(BaseDetector):
 
         return True, ""
 
-    def _create_debug_visualization(self):
-        """Create debug visualization with detected and rejected rifts"""
-        if not DebugConfig.ENABLED:
-            return
+    def _render_debug_image(self, image, candidates, rejected, ranked=(), chosen=None):
+        """
+        Draw detected and rejected rifts and the chosen target
 
-        debug_image = self.last_bgr_image.copy()
+        Args:
+            image: BGR frame to annotate (not modified)
+            candidates: accepted candidate dicts
+            rejected: rejected candidate dicts
+            ranked: ranked candidates, best first (unused, rifts are picked by area)
+            chosen: candidate selected as the target, or None
+
+        Returns:
+            Annotated BGR image
+        """
+        debug_image = image.copy()
 
         # Draw rejected candidates in blue
-        for obj in self.rejected:
+        for obj in rejected:
             cv2.circle(debug_image, obj['center'], 5, (255, 0, 0), 2)
             cv2.putText(debug_image, obj['reason'], (obj['center'][0], obj['center'][1] - 10),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 0, 0), 1)
@@ -53,32 +70,44 @@ class RiftDetector(BaseDetector):
         # Draw rift candidates in red
         debug_image = draw_detections(
             debug_image,
-            self.candidates,
+            candidates,
             (0, 0, 255),
             lambda obj, i: f"RIFT A:{int(obj['area'])} H:{int(obj['hue'])} V:{int(obj['value'])}"
         )
 
         # Use thicker lines for rifts
-        for candidate in self.candidates:
+        for candidate in candidates:
             cv2.drawContours(debug_image, [candidate['contour']], -1, (0, 0, 255), 3)
 
+        return draw_ranking(debug_image, ranked, chosen)
+
+    def _create_debug_visualization(self):
+        """Publish to the live preview and save debug visualization if enabled"""
+        publish_preview('rift', self)
+
+        if not DebugConfig.ENABLED:
+            return
+
+        debug_image = self._render_debug_image(self.last_bgr_image, self.candidates, self.rejected,
+                                               self.ranked, self.chosen)
         save_debug_image(debug_image, DebugConfig.RIFT_DETECTED)
 
-    def detect(self):
+    def detect(self, frame=None):
         """
         Detect energy rift in screenshot
 
+        Args:
+            frame: already captured Frame to process, or None to capture one
+
         Returns:
-            tuple of ('rift', screen_x, screen_y) or None
+            Detection of kind 'rift' or None
         """
         # Capture and process image
-        self._capture_and_process()
+        self._capture_and_process(frame)
 
         # Apply morphological operations
-        self._apply_morphology([
-            ('close', RiftDetectionConfig.CLOSE_KERNEL_SIZE),
-            ('open', RiftDetectionConfig.OPEN_KERNEL_SIZE)
-        ])
+        self._apply_morphology(self._morphology_operations())
+        self._mark_stage('mask')
 
         # Save debug images
         self._save_debug_images(
@@ -86,31 +115,32 @@ class RiftDetector(BaseDetector):
             DebugConfig.RIFT_MASK,
             DebugConfig.RIFT_DETECTED
         )
+        self._mark_stage('debug_save')
 
         # Find contours
         contours = self._find_contours()
 
         # Filter candidates
-        self.candidates, self.rejected = self._filter_candidates(contours, self._filter_rift)
-
-        # Create debug visualization
-        self._create_debug_visualization()
+        self.candidates, self.rejected = self._filter_candidates(contours, self._filter_candidate)
+        self._mark_stage('filter')
 
         # Get best candidate (largest area)
         best_rift = self._get_best_candidate('area')
+        self.chosen = best_rift
+
+        # Create debug visualization
+        self._create_debug_visualization()
+        self._mark_stage('debug')
 
         if best_rift:
             # Convert to screen coordinates
-            screen_x, screen_y = ScreenConfig.to_screen_coords(
-                best_rift['center'][0],
-                best_rift['center'][1]
-            )
+            detection = self._make_detection('rift', best_rift)
 
-            print(f"Energy rift found at: ({screen_x}, {screen_y})")
-            print(f"  Area: {best_rift['area']}, Hue: {best_rift['hue']:.1f}, Value: {best_rift['value']:.1f}, Sat: {best_rift['saturation']:.1f}")
+            self._log(f"Energy rift found at: ({detection.x}, {detection.y})")
+            self._log(f"  Area: {best_rift['area']}, Hue: {best_rift['hue']:.1f}, Value: {best_rift['value']:.1f}, Sat: {best_rift['saturation']:.1f}")
 
-            return ('rift', screen_x, screen_y)
+            return detection
 
-        print("Energy rift not found")
-        print(f"  Rejected {len(self.rejected)} candidates (too small or too dark)")
+        self._log("Energy rift not found")
+        self._log(f"  Rejected {len(self.rejected)} candidates (too small or too dark)")
         return None
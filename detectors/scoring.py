@@ -0,0 +1,174 @@
+"""Target scoring by expected travel and retargeting cost"""
+import threading
+import numpy as np
+from backends import get_clock
+from config import ScoringConfig
+
+
+class TargetScorer:
+    """
+    Ranks candidates with a weighted cost model (lower cost is better)
+
+    Cost terms: distance from the player, distance from the cursor, blob
+    size and how many consecutive frames the candidate has been seen.
+    Sightings only count as consecutive while detection runs continuously
+    (frames at most STABILITY_MAX_GAP seconds apart) and since the last
+    reset(), which the bot calls whenever it clicks or rotates the camera.
+
+    One scorer may be shared by several pipeline workers: the stability
+    history is locked and only advanced by frames newer than the last one
+    applied, so it always follows frame ID order.
+    """
+
+    def __init__(self, max_area):
+        """
+        Initialize scorer
+
+        Args:
+            max_area: area used to normalize blob size
+        """
+        self.max_area = max_area
+        self.lock = threading.Lock()
+        self.last_frame_id = 0
+        self.last_captured_at = None
+        self.reset_at = float('-inf')
+        self.previous_centers = np.empty((0, 2), dtype=np.float32)
+        self.previous_hits = np.empty(0, dtype=np.int32)
+
+    def reset(self):
+        """Forget stability history; frames captured before now are not applied"""
+        with self.lock:
+            self.reset_at = get_clock().monotonic()
+            self.last_captured_at = None
+            self.previous_centers = np.empty((0, 2), dtype=np.float32)
+            self.previous_hits = np.empty(0, dtype=np.int32)
+
+    def _update_stability(self, centers, frame=None):
+        """
+        Match centers to the previous frame and count consecutive sightings
+
+        Args:
+            centers: (N, 2) array of candidate centers
+            frame: Frame the centers come from, or None for back-to-back
+                   calls; a frame older than the last one applied, or
+                   captured before the last reset, is scored without
+                   updating the history
+
+        Returns:
+            (N,) array of hit counts
+        """
+        with self.lock:
+            if frame is None:
+                hits = self._match_previous(centers)
+                self.previous_centers, self.previous_hits = centers, hits
+                return hits
+
+            if frame.captured_at < self.reset_at:
+                return np.ones(len(centers), dtype=np.int32)
+
+            continuous = (self.last_captured_at is not None
+                          and frame.captured_at - self.last_captured_at <= ScoringConfig.STABILITY_MAX_GAP)
+            hits = self._match_previous(centers) if continuous else np.ones(len(centers), dtype=np.int32)
+
+            if frame.frame_id > self.last_frame_id:
+                self.previous_centers, self.previous_hits = centers, hits
+                self.last_frame_id = frame.frame_id
+                self.last_captured_at = frame.captured_at
+        return hits
+
+    def _match_previous(self, centers):
+        """
+        Count consecutive sightings against the stored history
+
+        Pairs are matched one-to-one, closest first, so two candidates can
+        never inherit the history of the same previous target.
+
+        Args:
+            centers: (N, 2) array of candidate centers
+
+        Returns:
+            (N,) array of hit counts
+        """
+        hits = np.ones(len(centers), dtype=np.int32)
+        if not len(centers) or not len(self.previous_centers):
+            return hits
+
+        # Pairwise squared distances to previous frame centers
+        diff = centers[:, None, :] - self.previous_centers[None, :, :]
+        distances = np.einsum('ijk,ijk->ij', diff, diff)
+
+        # Greedy assignment over pairs within the radius, closest first
+        current, previous = np.nonzero(distances <= ScoringConfig.STABILITY_RADIUS ** 2)
+        order = np.argsort(distances[current, previous], kind='stable')
+        used_current, used_previous = set(), set()
+        for i, j in zip(current[order], previous[order]):
+            if i in used_current or j in used_previous:
+                continue
+            used_current.add(i)
+            used_previous.add(j)
+            hits[i] = min(self.previous_hits[j] + 1, ScoringConfig.STABILITY_FRAMES)
+
+        return hits
+
+    def score(self, candidates, region_size, cursor, frame=None):
+        """
+        Compute cost for every candidate
+
+        Args:
+            candidates: list of candidate dicts with 'center' and 'area'
+            region_size: (width, height) of the capture region
+            cursor: cursor position in region coordinates
+            frame: source Frame (orders and gates the stability history)
+
+        Returns:
+            (N,) array of costs
+        """
+        if not candidates:
+            self._update_stability(np.empty((0, 2), dtype=np.float32), frame)
+            return np.empty(0, dtype=np.float32)
+
+        centers = np.array([c['center'] for c in candidates], dtype=np.float32)
+        areas = np.array([c['area'] for c in candidates], dtype=np.float32)
+
+        width, height = region_size
+        diagonal = float(np.hypot(width, height))
+        player = np.array([width * ScoringConfig.PLAYER_POSITION[0],
+                           height * ScoringConfig.PLAYER_POSITION[1]], dtype=np.float32)
+
+        player_distance = np.linalg.norm(centers - player, axis=1) / diagonal
+        cursor_distance = np.linalg.norm(centers - np.asarray(cursor, dtype=np.float32), axis=1) / diagonal
+        size = np.minimum(areas / self.max_area, 1.0)
+        stability = self._update_stability(centers, frame) / ScoringConfig.STABILITY_FRAMES
+
+        return (ScoringConfig.PLAYER_DISTANCE_WEIGHT * player_distance
+                + ScoringConfig.CURSOR_DISTANCE_WEIGHT * cursor_distance
+                - ScoringConfig.SIZE_WEIGHT * size
+                - ScoringConfig.STABILITY_WEIGHT * stability)
+
+    def rank(self, candidates, region_size, cursor, k=None, frame=None):
+        """
+        Score candidates and return the k cheapest
+
+        Each candidate dict gets a 'cost' entry.
+
+        Args:
+            candidates: list of candidate dicts with 'center' and 'area'
+            region_size: (width, height) of the capture region
+            cursor: cursor position in region coordinates
+            k: number of candidates to return (default: ScoringConfig.TOP_K)
+            frame: source Frame (orders and gates the stability history)
+
+        Returns:
+            list of candidate dicts, cheapest first
+        """
+        costs = self.score(candidates, region_size, cursor, frame)
+        if not len(costs):
+            return []
+
+        for candidate, cost in zip(candidates, costs):
+            candidate['cost'] = float(cost)
+
+        k = min(k or ScoringConfig.TOP_K, len(costs))
+        top = np.argpartition(costs, k - 1)[:k]
+        top = top[np.argsort(costs[top])]
+        return [candidates[i] for i in top]
@@ -1,16 +1,34 @@
 """Wisp detection using blob detection"""
 from detectors.base import BaseDetector
-from utils.image_processor import draw_detections, draw_rejected_objects, save_debug_image
-from config import WispDetectionConfig, ScreenConfig, DebugConfig
+from detectors.scoring import TargetScorer
+from backends import get_input_backend
+from utils.image_processor import draw_detections, draw_ranking, draw_rejected_objects, save_debug_image
+from utils.preview_server import publish_preview
+from config import WispDetectionConfig, ScoringConfig, DebugConfig
 
 
 class WispDetector(BaseDetector):
     """Detector for wisps using blob detection"""
 
-    def __init__(self):
+    def __init__(self, scorer=None):
+        """
+        Initialize detector
+
+        Args:
+            scorer: TargetScorer to use, e.g. one shared by pipeline workers
+                    (default: a new scorer)
+        """
         super().__init__(WispDetectionConfig)
+        self.scorer = scorer or TargetScorer(WispDetectionConfig.MAX_AREA)
+
+    def _morphology_operations(self):
+        """Morphological operations used to clean the wisp mask"""
+        return [
+            ('open', WispDetectionConfig.MORPH_KERNEL_SIZE),
+            ('close', WispDetectionConfig.MORPH_KERNEL_SIZE)
+        ]
 
-    def _filter_wisp(self, props):
+    def _filter_candidate(self, props):
         """
         Filter function for wisp candidates
 
@@ -36,17 +54,46 @@ class WispDetector(BaseDetector):
 
         return True, ""
 
-    def _create_debug_visualization(self):
-        """Create debug visualization with detected and rejected wisps"""
-        if not DebugConfig.ENABLED:
-            return
+    def _select_target(self):
+        """
+        Pick the wisp to click
+
+        Uses the scoring cost model (distance from player and cursor, size,
+        stability) when enabled, otherwise the largest blob.
+
+        Returns:
+            Best candidate or None
+        """
+        self.ranked = []
+        if not ScoringConfig.ENABLED:
+            return self._get_best_candidate('area')
 
-        debug_image = self.last_bgr_image.copy()
+        region_x, region_y, region_width, region_height = self.last_frame.region
+        cursor_x, cursor_y = get_input_backend().position()
+        cursor = (cursor_x - region_x, cursor_y - region_y)
 
+        self.ranked = self.scorer.rank(self.candidates, (region_width, region_height), cursor,
+                                       frame=self.last_frame)
+        return self.ranked[0] if self.ranked else None
+
+    def _render_debug_image(self, image, candidates, rejected, ranked=(), chosen=None):
+        """
+        Draw detected and rejected wisps, the top ranked ones and the target
+
+        Args:
+            image: BGR frame to annotate (not modified)
+            candidates: accepted candidate dicts
+            rejected: rejected candidate dicts
+            ranked: TOP_K cheapest candidates, best first
+            chosen: candidate selected as the target, or None
+
+        Returns:
+            Annotated BGR image
+        """
         # Draw rejected objects in red
         debug_image = draw_rejected_objects(
-            debug_image,
-            self.rejected,
+            image,
+            rejected,
             (0, 0, 255),
             lambda obj: obj['reason']
         )
@@ -54,28 +101,41 @@ class WispDetector(BaseDetector):
         # Draw wisp candidates in green
         debug_image = draw_detections(
             debug_image,
-            self.candidates,
+            candidates,
             (0, 255, 0),
             lambda obj, i: f"W{i+1} A:{int(obj['area'])} C:{obj['circularity']:.2f} H:{int(obj['hue'])}"
         )
 
+        # Mark ranking and chosen target in yellow
+        return draw_ranking(debug_image, ranked, chosen)
+
+    def _create_debug_visualization(self):
+        """Publish to the live preview and save debug visualization if enabled"""
+        publish_preview('wisp', self)
+
+        if not DebugConfig.ENABLED:
+            return
+
+        debug_image = self._render_debug_image(self.last_bgr_image, self.candidates, self.rejected,
+                                               self.ranked, self.chosen)
         save_debug_image(debug_image, DebugConfig.WISP_DETECTED)
 
-    def detect(self):
+    def detect(self, frame=None):
         """
         Detect wisps in screenshot
 
+        Args:
+            frame: already captured Frame to process, or None to capture one
+
         Returns:
-            tuple of ('wisp', screen_x, screen_y) or None
+            Detection of kind 'wisp' or None
         """
         # Capture and process image
-        self._capture_and_process()
+        self._capture_and_process(frame)
 
         # Apply morphological operations
-        self._apply_morphology([
-            ('open', WispDetectionConfig.MORPH_KERNEL_SIZE),
-            ('close', WispDetectionConfig.MORPH_KERNEL_SIZE)
-        ])
+        self._apply_morphology(self._morphology_operations())
+        self._mark_stage('mask')
 
         # Save debug images
         self._save_debug_images(
@@ -83,30 +143,34 @@ class WispDetector(BaseDetector):
             DebugConfig.WISP_MASK,
             DebugConfig.WISP_DETECTED
         )
+        self._mark_stage('debug_save')
 
         # Find contours
         contours = self._find_contours()
 
         # Filter candidates
-        self.candidates, self.rejected = self._filter_candidates(contours, self._filter_wisp)
-
-        # Create debug visualization
-        self._create_debug_visualization()
+        self.candidates, self.rejected = self._filter_candidates(contours, self._filter_candidate)
+        self._mark_stage('filter')
 
         # Get best candidate
-        best_wisp = self._get_best_candidate('area')
+        best_wisp = self._select_target()
+        self.chosen = best_wisp
+        self._mark_stage('select')
+
+        # Create debug visualization (after selection, so costs and target are known)
+        self._create_debug_visualization()
+        self._mark_stage('debug')
 
         if best_wisp:
             # Convert to screen coordinates
-            screen_x, screen_y = ScreenConfig.to_screen_coords(
-                best_wisp['center'][0],
-                best_wisp['center'][1]
-            )
+            detection = self._make_detection('wisp', best_wisp)
 
-            print(f"Wisp found at screen coordinates: ({screen_x}, {screen_y})")
-            print(f"Area: {best_wisp['area']}, Circularity: {best_wisp['circularity']:.2f}, Hue: {best_wisp['hue']:.1f}")
+            self._log(f"Wisp found at screen coordinates: ({detection.x}, {detection.y})")
+            self._log(f"Area: {best_wisp['area']}, Circularity: {best_wisp['circularity']:.2f}, Hue: {best_wisp['hue']:.1f}")
+            if 'cost' in best_wisp:
+                self._log(f"Cost: {best_wisp['cost']:.3f} (best of {len(self.candidates)} candidates)")
 
-            return ('wisp', screen_x, screen_y)
+            return detection
 
-        print("No wisps detected")
+        self._log("No wisps detected")
         return None
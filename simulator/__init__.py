@@ -0,0 +1 @@
+"""Headless game simulator for offline testing of the full bot loop"""
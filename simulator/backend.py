@@ -0,0 +1,98 @@
+"""Input backends driving the simulated game and replayed frames"""
+import os
+import cv2
+from backends.input import InputBackend
+
+
+class SimulatedInputBackend(InputBackend):
+    """Routes mouse, keyboard and screenshots to a SimulatedGame"""
+
+    def __init__(self, game, clock):
+        """
+        Initialize backend
+
+        Args:
+            game: SimulatedGame instance
+            clock: clock used for movement durations and render times
+        """
+        self.game = game
+        self.clock = clock
+        self.cursor = (game.width // 2, game.height // 2)
+
+    def move_to(self, x, y, duration=0.0):
+        # Cursor arrives at the target once the movement finishes
+        self.clock.sleep(duration)
+        self.cursor = (int(x), int(y))
+
+    def click(self):
+        self.game.click(self.cursor[0], self.cursor[1], self.clock.monotonic())
+
+    def key_down(self, key):
+        self.game.key_down(key, self.clock.monotonic())
+
+    def key_up(self, key):
+        self.game.key_up(key, self.clock.monotonic())
+
+    def position(self):
+        return self.cursor
+
+    def size(self):
+        return self.game.width, self.game.height
+
+    def screenshot(self, region=None):
+        image = self.game.render(self.clock.monotonic())
+        if region is not None:
+            x, y, width, height = region
+            image = image[y:y + height, x:x + width]
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+class ReplayInputBackend(InputBackend):
+    """Serves recorded frames as screenshots, cycling through them"""
+
+    def __init__(self, frames, screen_size=None):
+        """
+        Initialize backend
+
+        Args:
+            frames: list of BGR images captured from the game region
+            screen_size: (width, height) reported by size(), defaults to the frame size
+        """
+        if not frames:
+            raise ValueError("ReplayInputBackend needs at least one frame")
+        self.frames = frames
+        self.index = 0
+        self.cursor = (0, 0)
+        height, width = frames[0].shape[:2]
+        self.screen_size = screen_size or (width, height)
+
+    @classmethod
+    def from_directory(cls, directory):
+        """Load all PNG frames in a directory, sorted by name"""
+        names = sorted(name for name in os.listdir(directory) if name.lower().endswith('.png'))
+        frames = [cv2.imread(os.path.join(directory, name)) for name in names]
+        return cls([frame for frame in frames if frame is not None])
+
+    def move_to(self, x, y, duration=0.0):
+        self.cursor = (int(x), int(y))
+
+    def click(self):
+        pass
+
+    def key_down(self, key):
+        pass
+
+    def key_up(self, key):
+        pass
+
+    def position(self):
+        return self.cursor
+
+    def size(self):
+        return self.screen_size
+
+    def screenshot(self, region=None):
+        # Recorded frames already cover the capture region
+        frame = self.frames[self.index]
+        self.index = (self.index + 1) % len(self.frames)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
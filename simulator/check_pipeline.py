@@ -0,0 +1,151 @@
+"""Scripted deterministic check of the detection pipeline building blocks
+
+Drives LatestFrameSlot, ResultBoard, DetectionPipeline.wait_for_result and
+the shared TargetScorer directly from one thread, with hand-made frames and
+results in a fixed order, so every step has exactly one expected outcome.
+
+Usage:
+    python -m simulator.check_pipeline
+"""
+import sys
+import numpy as np
+import backends
+from backends.clock import VirtualClock
+from detectors.base import Detection
+from detectors.pipeline import DetectionPipeline, LatestFrameSlot, ResultBoard
+from detectors.scoring import TargetScorer
+from utils.image_processor import Frame
+
+
+def _frame(frame_id):
+    """Placeholder frame captured 0.1s after the previous ID; no image data"""
+    return Frame(None, None, frame_id * 0.1, (0, 0, 800, 600), frame_id)
+
+
+def _detection(frame_id):
+    return Detection('wisp', frame_id, frame_id, float(frame_id), float(frame_id), frame_id, (0, 0, 800, 600))
+
+
+def check_slot():
+    """Only the newest frame is handed out, and each frame only once"""
+    slot = LatestFrameSlot()
+    assert slot.take(timeout=0) is None, "empty slot returned a frame"
+
+    for frame_id in (1, 2, 3):
+        slot.put(_frame(frame_id))
+    assert slot.latest_frame_id() == 3
+    assert slot.take(timeout=0).frame_id == 3, "slot did not hand out the newest frame"
+    assert slot.take(timeout=0) is None, "slot handed out the same frame twice"
+
+    slot.put(_frame(4))
+    assert slot.take(timeout=0).frame_id == 4
+
+    slot.put(_frame(5))
+    slot.close()
+    assert slot.take(timeout=0) is None, "closed slot returned a frame"
+
+
+def check_board():
+    """Results finishing out of frame order never replace newer ones"""
+    board = ResultBoard()
+    board.publish('wisp', 5, _detection(5))
+    board.publish('wisp', 3, _detection(3))
+    assert board.results['wisp'][0] == 5, "older result replaced a newer one"
+    board.publish('wisp', 5, None)
+    assert board.results['wisp'][1] is not None, "duplicate frame ID replaced the result"
+
+    board.publish('wisp', 7, None)
+    assert board.results['wisp'] == (7, None)
+
+    # Kinds are independent
+    board.publish('rift', 2, _detection(2))
+    assert board.results['rift'][0] == 2
+
+
+def check_wait_for_result():
+    """wait_for_result only returns results from frames newer than asked"""
+    pipeline = DetectionPipeline({}, workers=1)
+
+    assert pipeline.wait_for_result('wisp', newer_than=0, timeout=0) is None
+
+    pipeline.board.publish('wisp', 4, _detection(4))
+    assert pipeline.wait_for_result('wisp', newer_than=4, timeout=0) is None, \
+        "returned a result from the frame it had to be newer than"
+    assert pipeline.wait_for_result('wisp', newer_than=3, timeout=0)[0] == 4
+
+    # Default newer_than is the newest captured frame
+    pipeline.slot.put(_frame(6))
+    assert pipeline.wait_for_result('wisp', timeout=0) is None, \
+        "returned a result from before the newest captured frame"
+    pipeline.board.publish('wisp', 5, _detection(5))
+    assert pipeline.wait_for_result('wisp', timeout=0) is None
+    pipeline.board.publish('wisp', 7, None)
+    assert pipeline.wait_for_result('wisp', timeout=0) == (7, None)
+
+    pipeline.error = RuntimeError("capture failed")
+    try:
+        pipeline.wait_for_result('wisp', newer_than=0, timeout=0)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("worker error was not raised")
+
+
+def check_shared_scorer():
+    """A stale frame scored late does not rewrite the stability history"""
+    scorer = TargetScorer(max_area=1000)
+    centers = np.array([[100, 100]], dtype=np.float32)
+    elsewhere = np.array([[500, 400]], dtype=np.float32)
+
+    assert list(scorer._update_stability(centers, _frame(1))) == [1]
+    assert list(scorer._update_stability(centers, _frame(3))) == [2]
+
+    # Frame 2 finishes after frame 3: scored, but history stays at frame 3
+    scorer._update_stability(elsewhere, _frame(2))
+    assert scorer.last_frame_id == 3
+    assert list(scorer._update_stability(centers, _frame(4))) == [3], "stale frame broke the history"
+
+
+def check_scorer_history():
+    """Stability needs continuous frames since the last reset, matched one-to-one"""
+    clock = VirtualClock()
+    with backends.use_backends(None, clock):
+        scorer = TargetScorer(max_area=1000)
+        pair = np.array([[100, 100], [104, 100]], dtype=np.float32)
+        single = np.array([[102, 100]], dtype=np.float32)
+
+        scorer._update_stability(single, _frame(1))
+        assert sorted(scorer._update_stability(pair, _frame(2))) == [1, 2], \
+            "two candidates inherited the same previous target"
+
+        # Gap longer than STABILITY_MAX_GAP: history does not carry over
+        assert list(scorer._update_stability(single, _frame(20))) == [1]
+        assert list(scorer._update_stability(single, _frame(21))) == [2]
+
+        # Frames captured before a reset (e.g. in flight during a click) are ignored
+        clock.sleep(2.25)
+        scorer.reset()
+        assert list(scorer._update_stability(single, _frame(22))) == [1]
+        assert scorer.last_frame_id == 21, "frame from before the reset updated the history"
+        scorer._update_stability(single, _frame(23))
+        assert list(scorer._update_stability(single, _frame(24))) == [2]
+
+
+CHECKS = [check_slot, check_board, check_wait_for_result, check_shared_scorer, check_scorer_history]
+
+
+def main():
+    failures = 0
+    for check in CHECKS:
+        try:
+            check()
+        except AssertionError as e:
+            failures += 1
+            print(f"FAIL {check.__name__}: {e}")
+        else:
+            print(f"ok   {check.__name__}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
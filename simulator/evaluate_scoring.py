@@ -0,0 +1,113 @@
+"""Replay-based evaluation of target selection strategies
+
+Runs the wisp detector over recorded or synthetic frames and, for each
+frame, lets every strategy pick a target. Each strategy moves its own
+simulated cursor to its choice, so cursor travel reflects retargeting.
+
+Usage:
+    python -m simulator.evaluate_scoring --frames 2000
+    python -m simulator.evaluate_scoring --replay recorded-frames/
+"""
+import argparse
+import numpy as np
+from detectors.scoring import TargetScorer
+from detectors.wisp_detector import WispDetector
+from simulator.frames import frame_source
+from simulator.run import override_config
+from utils.latency import percentile
+from config import DebugConfig, ScoringConfig, ScreenConfig, WindowLocatorConfig, WispDetectionConfig
+
+
+def _pick_largest(candidates, region_size, cursor, frame):
+    """Baseline strategy: largest blob"""
+    return max(candidates, key=lambda c: c['area'])
+
+
+def _make_scored_strategy():
+    """Cost model strategy with its own stability history"""
+    scorer = TargetScorer(WispDetectionConfig.MAX_AREA)
+
+    def pick(candidates, region_size, cursor, frame):
+        return scorer.rank(candidates, region_size, cursor, k=1, frame=frame)[0]
+
+    return pick
+
+
+def evaluate(frame_count=None, replay_dir=None, seed=0):
+    """
+    Compare target selection strategies on the same frames
+
+    Args:
+        frame_count: number of synthetic frames (ignored when replaying)
+        replay_dir: directory of recorded PNG frames, or None for synthetic frames
+        seed: scene seed for synthetic frames
+
+    Returns:
+        dict of strategy name -> dict with choices and distance stats (pixels)
+    """
+    strategies = {
+        'largest': _pick_largest,
+        'scored': _make_scored_strategy()
+    }
+
+    region_size = (ScreenConfig.REGION_WIDTH, ScreenConfig.REGION_HEIGHT)
+    player = np.array([region_size[0] * ScoringConfig.PLAYER_POSITION[0],
+                       region_size[1] * ScoringConfig.PLAYER_POSITION[1]])
+    cursors = {name: player.copy() for name in strategies}
+    distances = {name: {'player': [], 'cursor': []} for name in strategies}
+
+    overrides = {'ENABLED': False}
+
+    with override_config(DebugConfig, overrides), \
+            override_config(WindowLocatorConfig, overrides), \
+            override_config(ScoringConfig, overrides), \
+            frame_source(replay_dir, seed) as source:
+        if source.frame_count is not None:
+            # One pass over the recorded frames
+            frame_count = source.frame_count
+
+        detector = WispDetector()
+        detector.verbose = False
+        for _ in range(frame_count):
+            detector.detect()
+            source.step()
+
+            if not detector.candidates:
+                continue
+
+            for name, pick in strategies.items():
+                choice = np.array(pick(detector.candidates, region_size, cursors[name], detector.last_frame)['center'], dtype=float)
+                distances[name]['player'].append(float(np.linalg.norm(choice - player)))
+                distances[name]['cursor'].append(float(np.linalg.norm(choice - cursors[name])))
+                cursors[name] = choice
+
+    results = {}
+    for name, values in distances.items():
+        results[name] = {'choices': len(values['player'])}
+        for kind, series in values.items():
+            if series:
+                results[name][f'{kind}_mean'] = sum(series) / len(series)
+                results[name][f'{kind}_p95'] = percentile(series, 95)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate target selection strategies on replayed frames")
+    parser.add_argument('--frames', type=int, default=1000, help="number of synthetic frames")
+    parser.add_argument('--replay', help="directory of recorded PNG frames (default: synthetic)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = evaluate(args.frames, args.replay, args.seed)
+    print("Expected travel distance per choice (pixels):")
+    for name, stats in results.items():
+        if not stats['choices']:
+            print(f"  {name}: no choices")
+            continue
+        print(f"  {name}: {stats['choices']} choices, "
+              f"player mean {stats['player_mean']:.1f} p95 {stats['player_p95']:.1f}, "
+              f"cursor mean {stats['cursor_mean']:.1f} p95 {stats['cursor_p95']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Synthetic and replayed frame sources for detector-only runs"""
+import contextlib
+import backends
+from backends.clock import VirtualClock
+from simulator.backend import ReplayInputBackend
+from simulator.run import simulated_backends
+from config import SimulatorConfig
+
+
+class FrameSource:
+    """
+    Frames served through the input backend, advanced with step()
+
+    Synthetic frames come from the simulated scene, which moves with the
+    virtual clock and turns the camera a little every step. Replayed
+    frames are served in order by the replay backend.
+    """
+
+    def __init__(self, clock, game=None, frame_count=None):
+        """
+        Initialize source
+
+        Args:
+            clock: VirtualClock the backends run on
+            game: SimulatedGame for synthetic frames, or None when replaying
+            frame_count: number of recorded frames, or None for synthetic frames
+        """
+        self.clock = clock
+        self.game = game
+        self.frame_count = frame_count
+
+    def step(self):
+        """Advance to the next frame"""
+        self.clock.sleep(SimulatorConfig.FRAME_INTERVAL)
+        if self.game is not None:
+            self.game.yaw = (self.game.yaw + SimulatorConfig.YAW_STEP) % 360
+
+
+@contextlib.contextmanager
+def frame_source(replay_dir=None, seed=0):
+    """
+    Install backends serving synthetic or replayed frames
+
+    Args:
+        replay_dir: directory of recorded PNG frames, or None for synthetic frames
+        seed: scene seed for synthetic frames
+
+    Yields:
+        FrameSource
+    """
+    if replay_dir:
+        clock = VirtualClock()
+        backend = ReplayInputBackend.from_directory(replay_dir)
+        with backends.use_backends(backend, clock):
+            yield FrameSource(clock, frame_count=len(backend.frames))
+    else:
+        with simulated_backends(seed) as (game, clock):
+            yield FrameSource(clock, game)
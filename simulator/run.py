@@ -0,0 +1,124 @@
+"""Run the bot against the simulated game under a virtual clock
+
+Usage:
+    python -m simulator.run --hours 8 --strategy all
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+import backends
+from backends.clock import VirtualClock
+from controllers.bot import BotController
+from simulator.backend import SimulatedInputBackend
+from simulator.scene import SimulatedGame
+from config import BotConfig, DebugConfig, PreviewConfig, ScoringConfig, WindowLocatorConfig
+
+
+# Named config overrides compared by the simulator
+STRATEGIES = {
+    'default': {},
+    'no-reverify': {BotConfig: {'REVERIFY_STALE_TARGETS': False}},
+    'fast-click': {BotConfig: {'MIN_CLICK_DURATION': 0.1, 'MAX_CLICK_DURATION': 0.2}},
+    'short-harvest': {BotConfig: {'MIN_HARVEST_TIME': 10, 'MAX_HARVEST_TIME': 15}},
+    'largest-target': {ScoringConfig: {'ENABLED': False}}
+}
+
+
+@contextlib.contextmanager
+def override_config(config_class, overrides):
+    """Temporarily set attributes on a config class"""
+    original = {name: getattr(config_class, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(config_class, name, value)
+    try:
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(config_class, name, value)
+
+
+@contextlib.contextmanager
+def simulated_backends(seed):
+    """
+    Install simulator input backend and virtual clock
+
+    Yields:
+        tuple of (SimulatedGame, VirtualClock)
+    """
+    clock = VirtualClock()
+    game = SimulatedGame(seed)
+    with backends.use_backends(SimulatedInputBackend(game, clock), clock):
+        yield game, clock
+
+
+def run_simulation(hours, strategy='default', seed=None, quiet=True):
+    """
+    Run the full bot loop against the simulator
+
+    Args:
+        hours: simulated hours to run
+        strategy: name of a STRATEGIES entry
+        seed: random seed for the scene and bot timing
+        quiet: suppress bot output
+
+    Returns:
+        dict with game stats, harvests per hour and latency summary
+    """
+    overrides = {'ENABLED': False}
+    with contextlib.ExitStack() as stack:
+        for config_class, strategy_overrides in STRATEGIES[strategy].items():
+            stack.enter_context(override_config(config_class, strategy_overrides))
+        stack.enter_context(override_config(DebugConfig, overrides))
+        stack.enter_context(override_config(WindowLocatorConfig, overrides))
+        stack.enter_context(override_config(PreviewConfig, overrides))
+        game, clock = stack.enter_context(simulated_backends(seed))
+
+        random.seed(seed)
+        bot = BotController()
+
+        wall_start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull:
+            output = contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()
+            with output:
+                bot.run(duration=hours * 3600)
+        wall_time = time.perf_counter() - wall_start
+
+        simulated_hours = clock.monotonic() / 3600
+        return {
+            'strategy': strategy,
+            'simulated_hours': simulated_hours,
+            'wall_time': wall_time,
+            'harvests_per_hour': game.stats['harvests'] / simulated_hours,
+            **game.stats,
+            'latency': bot.latency.summary(),
+            'skipped_clicks': bot.latency.skipped_count()
+        }
+
+
+def _print_result(result):
+    """Print one simulation result"""
+    print(f"[{result['strategy']}] {result['simulated_hours']:.1f}h simulated in {result['wall_time']:.1f}s")
+    print(f"  Harvests: {result['harvests']} ({result['harvests_per_hour']:.1f}/h), "
+          f"conversions: {result['conversions']}, missed clicks: {result['missed_clicks']}, "
+          f"skipped clicks: {result['skipped_clicks']}, rotations: {result['rotations']}")
+    for stage, stats in result['latency'].items():
+        print(f"  {stage}: p50 {stats['p50'] * 1000:.0f}ms, p95 {stats['p95'] * 1000:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bot against the headless simulator")
+    parser.add_argument('--hours', type=float, default=4.0, help="simulated hours per strategy")
+    parser.add_argument('--strategy', default='default', choices=['all'] + list(STRATEGIES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help="show bot output")
+    args = parser.parse_args()
+
+    strategies = list(STRATEGIES) if args.strategy == 'all' else [args.strategy]
+    for strategy in strategies:
+        _print_result(run_simulation(args.hours, strategy, args.seed, quiet=not args.verbose))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Synthetic Divination scene"""
+import math
+import random
+import cv2
+import numpy as np
+from config import ScreenConfig, SimulatorConfig
+
+
+def _wrap_degrees(angle):
+    """Wrap angle to [-180, 180)"""
+    return (angle + 180) % 360 - 180
+
+
+class SimulatedWisp:
+    """Wisp drifting around the player at a fixed azimuth speed"""
+
+    def __init__(self, rng, spawn_time):
+        self.rng = rng
+        self.respawn(spawn_time)
+
+    def respawn(self, spawn_time):
+        """Place wisp at a new random position"""
+        self.spawn_time = spawn_time
+        self.azimuth = self.rng.uniform(0, 360)
+        self.height = self.rng.uniform(0.2, 0.8)
+        self.velocity = self.rng.uniform(-1, 1) * SimulatorConfig.WISP_DRIFT_SPEED
+        self.phase = self.rng.uniform(0, 2 * math.pi)
+        self.harvested_at = None
+
+    def position(self, now):
+        """Return (azimuth degrees, height fraction) at time now"""
+        elapsed = now - self.spawn_time
+        azimuth = self.azimuth + self.velocity * elapsed
+        height = self.height + SimulatorConfig.WISP_BOB_AMPLITUDE * math.sin(self.phase + elapsed)
+        return azimuth, height
+
+
+class SimulatedGame:
+    """
+    Headless game state rendered as a synthetic screen
+
+    Objects live at an azimuth around the player and are projected into
+    the ScreenConfig viewport according to the camera yaw. Time is passed
+    in explicitly, so the scene works with any clock.
+    """
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(SimulatorConfig.SEED if seed is None else seed)
+        self.width, self.height = SimulatorConfig.SCREEN_SIZE
+        self.viewport = ScreenConfig.get_region()
+        self.yaw = 0.0
+        self.wisps = [SimulatedWisp(self.rng, 0.0) for _ in range(SimulatorConfig.NUM_WISPS)]
+        self.decoys = [
+            (self.rng.uniform(0, 360), self.rng.uniform(0.1, 0.9), self.rng.randint(8, 30))
+            for _ in range(SimulatorConfig.NUM_DECOYS)
+        ]
+        self.memories = 0
+        self.stats = {
+            'clicks': 0,
+            'harvests': 0,
+            'conversions': 0,
+            'missed_clicks': 0,
+            'rotations': 0
+        }
+        self._held_keys = {}
+        self._render_cache = (None, None)
+
+    def _update(self, now):
+        """Respawn depleted wisps whose timer ran out"""
+        for wisp in self.wisps:
+            if wisp.harvested_at is not None and now - wisp.harvested_at >= SimulatorConfig.WISP_RESPAWN_TIME:
+                wisp.respawn(now)
+
+    def project(self, azimuth, height):
+        """
+        Project world position to screen coordinates
+
+        Returns:
+            (x, y) screen coordinates, or None if outside the field of view
+        """
+        offset = _wrap_degrees(azimuth - self.yaw)
+        if abs(offset) > SimulatorConfig.FOV_DEGREES / 2:
+            return None
+
+        region_x, region_y, region_w, region_h = self.viewport
+        x = region_x + region_w / 2 + offset / SimulatorConfig.FOV_DEGREES * region_w
+        y = region_y + height * region_h
+        return int(round(x)), int(round(y))
+
+    def visible_objects(self, now):
+        """
+        List objects currently on screen
+
+        Returns:
+            list of (kind, object, (x, y), radius)
+        """
+        self._update(now)
+        objects = []
+
+        for wisp in self.wisps:
+            if wisp.harvested_at is not None:
+                continue
+            point = self.project(*wisp.position(now))
+            if point:
+                objects.append(('wisp', wisp, point, SimulatorConfig.WISP_RADIUS))
+
+        point = self.project(SimulatorConfig.RIFT_AZIMUTH, 0.5)
+        if point:
+            objects.append(('rift', None, point, SimulatorConfig.RIFT_RADIUS))
+
+        return objects
+
+    def render(self, now):
+        """
+        Render the full screen at time now
+
+        Returns:
+            BGR image of SCREEN_SIZE
+        """
+        cached_key, cached_image = self._render_cache
+        if cached_key == now:
+            return cached_image
+
+        # Objects are drawn on the viewport only, then pasted onto the screen
+        region_x, region_y, region_w, region_h = self.viewport
+        viewport = np.full((region_h, region_w, 3), SimulatorConfig.VIEWPORT_COLOR, dtype=np.uint8)
+
+        for azimuth, height, radius in self.decoys:
+            point = self.project(azimuth, height)
+            if point:
+                cv2.circle(viewport, (point[0] - region_x, point[1] - region_y), radius,
+                           SimulatorConfig.DECOY_COLOR, -1)
+
+        for kind, _, (x, y), radius in self.visible_objects(now):
+            center = (x - region_x, y - region_y)
+            if kind == 'rift':
+                cv2.ellipse(viewport, center, (radius, int(radius * 0.8)), 0, 0, 360,
+                            SimulatorConfig.RIFT_COLOR, -1)
+            else:
+                cv2.circle(viewport, center, radius, SimulatorConfig.WISP_COLOR, -1)
+
+        image = np.full((self.height, self.width, 3), SimulatorConfig.BACKGROUND_COLOR, dtype=np.uint8)
+        image[region_y:region_y + region_h, region_x:region_x + region_w] = viewport
+
+        self._render_cache = (now, image)
+        return image
+
+    def click(self, x, y, now):
+        """
+        Handle a click at screen coordinates
+
+        Clicking a wisp starts a harvest and depletes it; clicking the rift
+        converts any collected memories.
+
+        Returns:
+            kind of object clicked ('wisp', 'rift') or None
+        """
+        self.stats['clicks'] += 1
+
+        for kind, wisp, (obj_x, obj_y), radius in self.visible_objects(now):
+            reach = radius + SimulatorConfig.CLICK_TOLERANCE
+            if (x - obj_x) ** 2 + (y - obj_y) ** 2 > reach ** 2:
+                continue
+
+            if kind == 'wisp':
+                wisp.harvested_at = now
+                self._render_cache = (None, None)
+                self.memories += 1
+                self.stats['harvests'] += 1
+                return kind
+
+            if self.memories:
+                self.memories = 0
+                self.stats['conversions'] += 1
+                return kind
+
+        self.stats['missed_clicks'] += 1
+        return None
+
+    def key_down(self, key, now):
+        """Start holding key"""
+        self._held_keys[key] = now
+
+    def key_up(self, key, now):
+        """Release key; left/right arrows rotate the camera for the held time"""
+        pressed_at = self._held_keys.pop(key, None)
+        if pressed_at is None:
+            return
+
+        held = now - pressed_at
+        self._render_cache = (None, None)
+        if key == 'left':
+            self.yaw = (self.yaw - SimulatorConfig.YAW_SPEED * held) % 360
+        elif key == 'right':
+            self.yaw = (self.yaw + SimulatorConfig.YAW_SPEED * held) % 360
+        self.stats['rotations'] += 1
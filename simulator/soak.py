@@ -0,0 +1,230 @@
+"""Long-run soak test of the detectors with memory and latency drift tracking
+
+Runs the wisp and rift detectors on synthetic or replayed frames for many
+iterations, sampling RSS, tracemalloc top allocators and per-stage latency
+percentiles. Each sample is written as one compact JSON line.
+
+Usage:
+    python -m simulator.soak --iterations 1000000
+    python -m simulator.soak --frames recorded-frames/ --compare previous.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from detectors.wisp_detector import WispDetector
+from detectors.rift_detector import RiftDetector
+from simulator.frames import frame_source
+from simulator.run import override_config
+from utils.latency import percentile
+from config import DebugConfig, SoakConfig, WindowLocatorConfig
+
+
+def current_rss_bytes():
+    """Return resident set size of this process in bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        # No procfs (macOS, Windows): fall back to peak RSS
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _top_allocators(snapshot, limit):
+    """Return [[location, bytes], ...] for the largest allocating lines"""
+    top = []
+    for stat in snapshot.statistics('lineno')[:limit]:
+        frame = stat.traceback[0]
+        top.append([f"{os.path.relpath(frame.filename)}:{frame.lineno}", stat.size])
+    return top
+
+
+def _take_sample(iteration, wall_start, stage_times):
+    """Build one time series record and reset the stage windows"""
+    sample = {
+        'i': iteration,
+        't': round(time.perf_counter() - wall_start, 2),
+        'rss': current_rss_bytes(),
+        'p50': {},
+        'p99': {}
+    }
+
+    if tracemalloc.is_tracing():
+        sample['traced'] = tracemalloc.get_traced_memory()[0]
+        sample['top'] = _top_allocators(tracemalloc.take_snapshot(), SoakConfig.TRACEMALLOC_TOP)
+
+    for stage, values in stage_times.items():
+        if not values:
+            continue
+        sample['p50'][stage] = round(percentile(values, 50) * 1000, 3)
+        sample['p99'][stage] = round(percentile(values, 99) * 1000, 3)
+        values.clear()
+
+    return sample
+
+
+def check_drift(samples):
+    """
+    Check every post-warmup sample against the baseline
+
+    The baseline is the first sample after WARMUP_SAMPLES. A leak or a
+    slowdown that recovers before the end of the run still fails; each
+    bound is reported once, for the worst sample. A run too short to have
+    any sample after the baseline fails too, since nothing was checked.
+
+    Args:
+        samples: list of sample dicts in iteration order
+
+    Returns:
+        list of failure messages (empty if within bounds)
+    """
+    needed = SoakConfig.WARMUP_SAMPLES + 2
+    if len(samples) < needed:
+        return [f"only {len(samples)} samples, drift check needs at least {needed} "
+                f"(raise --iterations or lower --sample-every)"]
+
+    baseline = samples[SoakConfig.WARMUP_SAMPLES]
+    checked = samples[SoakConfig.WARMUP_SAMPLES + 1:]
+    failures = []
+
+    growth = [((sample['rss'] - baseline['rss']) / (1024 * 1024), sample) for sample in checked]
+    over = [item for item in growth if item[0] > SoakConfig.MAX_RSS_GROWTH_MB]
+    if over:
+        growth_mb, worst = max(over, key=lambda item: item[0])
+        failures.append(f"RSS grew {growth_mb:.1f}MB by iteration {worst['i']} "
+                        f"(limit {SoakConfig.MAX_RSS_GROWTH_MB}MB, exceeded in {len(over)}/{len(checked)} samples)")
+
+    for stage, base_p99 in baseline['p99'].items():
+        if base_p99 <= 0:
+            continue
+        ratios = [(sample['p99'][stage] / base_p99, sample) for sample in checked if stage in sample['p99']]
+        over = [(ratio, sample) for ratio, sample in ratios
+                if ratio > SoakConfig.MAX_P99_DRIFT_RATIO
+                and sample['p99'][stage] - base_p99 >= SoakConfig.MIN_P99_DRIFT_MS]
+        if not over:
+            continue
+        ratio, worst = max(over, key=lambda item: item[0])
+        failures.append(f"{stage} p99 drifted {base_p99:.2f}ms -> {worst['p99'][stage]:.2f}ms "
+                        f"at iteration {worst['i']} (x{ratio:.2f}, limit x{SoakConfig.MAX_P99_DRIFT_RATIO}, "
+                        f"exceeded in {len(over)}/{len(ratios)} samples)")
+
+    return failures
+
+
+def run_soak(iterations, frames_dir=None, output_file=None, seed=0):
+    """
+    Run detectors repeatedly and record a memory/latency time series
+
+    Args:
+        iterations: number of detection iterations (wisp and rift each)
+        frames_dir: directory of recorded PNG frames, or None for synthetic frames
+        output_file: JSON lines output path
+        seed: scene seed for synthetic frames
+
+    Returns:
+        list of sample dicts
+    """
+    overrides = {'ENABLED': False}
+    samples = []
+
+    with override_config(DebugConfig, overrides), \
+            override_config(WindowLocatorConfig, overrides), \
+            frame_source(frames_dir, seed) as source, \
+            open(output_file, 'w') as out:
+        detectors = [WispDetector(), RiftDetector()]
+        for detector in detectors:
+            detector.verbose = False
+        stage_times = {}
+
+        out.write(json.dumps({'meta': {
+            'iterations': iterations,
+            'source': frames_dir or 'synthetic',
+            'sample_every': SoakConfig.SAMPLE_EVERY,
+            'python': sys.version.split()[0]
+        }}, separators=(',', ':')) + '\n')
+
+        if SoakConfig.TRACEMALLOC:
+            tracemalloc.start(SoakConfig.TRACEMALLOC_FRAMES)
+
+        wall_start = time.perf_counter()
+        try:
+            for iteration in range(1, iterations + 1):
+                for detector in detectors:
+                    start = time.perf_counter()
+                    detector.detect()
+                    total = time.perf_counter() - start
+
+                    name = type(detector).__name__.replace('Detector', '').lower()
+                    for stage, seconds in detector.stage_times.items():
+                        stage_times.setdefault(f"{name}.{stage}", []).append(seconds)
+                    stage_times.setdefault(f"{name}.total", []).append(total)
+
+                source.step()
+
+                if iteration % SoakConfig.SAMPLE_EVERY == 0 or iteration == iterations:
+                    sample = _take_sample(iteration, wall_start, stage_times)
+                    samples.append(sample)
+                    out.write(json.dumps(sample, separators=(',', ':')) + '\n')
+                    out.flush()
+                    print(f"[{iteration}/{iterations}] RSS {sample['rss'] / 2 ** 20:.1f}MB, "
+                          f"wisp p99 {sample['p99'].get('wisp.total', 0):.2f}ms, "
+                          f"rift p99 {sample['p99'].get('rift.total', 0):.2f}ms")
+        finally:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    return samples
+
+
+def load_samples(filename):
+    """Load sample records from a soak output file (skipping metadata)"""
+    with open(filename) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [record for record in records if 'meta' not in record]
+
+
+def compare(samples, baseline_samples):
+    """Print final RSS and p99 latencies against a previous run"""
+    if not samples or not baseline_samples:
+        return
+
+    last, previous = samples[-1], baseline_samples[-1]
+    print(f"RSS: {previous['rss'] / 2 ** 20:.1f}MB -> {last['rss'] / 2 ** 20:.1f}MB")
+    for stage in sorted(last['p99']):
+        if stage in previous['p99']:
+            print(f"  {stage} p99: {previous['p99'][stage]:.3f}ms -> {last['p99'][stage]:.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test the detectors")
+    parser.add_argument('--iterations', type=int, default=SoakConfig.ITERATIONS)
+    parser.add_argument('--sample-every', type=int, default=SoakConfig.SAMPLE_EVERY)
+    parser.add_argument('--frames', help="directory of recorded PNG frames (default: synthetic)")
+    parser.add_argument('--output', default=SoakConfig.OUTPUT_FILE)
+    parser.add_argument('--compare', help="previous soak output to compare against")
+    parser.add_argument('--no-tracemalloc', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    SoakConfig.SAMPLE_EVERY = args.sample_every
+    if args.no_tracemalloc:
+        SoakConfig.TRACEMALLOC = False
+
+    samples = run_soak(args.iterations, args.frames, args.output, args.seed)
+    print(f"Wrote {len(samples)} samples to {args.output}")
+
+    if args.compare:
+        compare(samples, load_samples(args.compare))
+
+    failures = check_drift(samples)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
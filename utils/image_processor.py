@@ -1,26 +1,57 @@
 """Image capture and processing utilities"""
-import pyautogui
 import cv2
 import numpy as np
 import os
+import itertools
+import threading
+from collections import namedtuple
+from backends import get_input_backend, get_clock
 
 
-def capture_screenshot(region):
+# Captured frame with monotonic capture timestamp (seconds) and an
+# increasing frame ID
+Frame = namedtuple('Frame', ['bgr', 'hsv', 'captured_at', 'region', 'frame_id'])
+
+_frame_ids = itertools.count(1)
+
+# Debug images share file names, so concurrent writers are serialized
+_debug_write_lock = threading.Lock()
+
+
+def capture_bgr(region=None):
     """
-    Capture screenshot and convert to OpenCV format
+    Capture screenshot in BGR format
 
     Args:
-        region: tuple of (x, y, width, height)
+        region: tuple of (x, y, width, height), or None for the full screen
 
     Returns:
-        tuple of (BGR image, HSV image)
+        BGR image
     """
     # Take screenshot
-    screenshot = pyautogui.screenshot(region=region)
+    screenshot = get_input_backend().screenshot(region=region)
 
     # Convert PIL image to OpenCV format
     screenshot_np = np.array(screenshot)
-    screenshot_bgr = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
+    return cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
+
+
+def get_screen_size():
+    """Return (width, height) of the primary screen in screen coordinates"""
+    return get_input_backend().size()
+
+
+def capture_screenshot(region):
+    """
+    Capture screenshot and convert to OpenCV format
+
+    Args:
+        region: tuple of (x, y, width, height)
+
+    Returns:
+        tuple of (BGR image, HSV image)
+    """
+    screenshot_bgr = capture_bgr(region)
 
     # Convert to HSV
     hsv = cv2.cvtColor(screenshot_bgr, cv2.COLOR_BGR2HSV)
@@ -28,6 +59,24 @@ def capture_screenshot(region):
     return screenshot_bgr, hsv
 
 
+def capture_frame(region):
+    """
+    Capture screenshot stamped with the monotonic capture time
+
+    The timestamp is taken before the screenshot, so frame age is never
+    underestimated.
+
+    Args:
+        region: tuple of (x, y, width, height)
+
+    Returns:
+        Frame
+    """
+    captured_at = get_clock().monotonic()
+    bgr, hsv = capture_screenshot(region)
+    return Frame(bgr, hsv, captured_at, tuple(region), next(_frame_ids))
+
+
 def create_hsv_mask(hsv_image, lower_hsv, upper_hsv):
     """
     Create binary mask based on HSV range
@@ -82,7 +131,8 @@ def save_debug_image(image, filename):
     if directory and not os.path.exists(directory):
         os.makedirs(directory)
 
-    cv2.imwrite(filename, image)
+    with _debug_write_lock:
+        cv2.imwrite(filename, image)
 
 
 def draw_detections(image, objects, color, label_fn=None):
@@ -116,6 +166,31 @@ def draw_detections(image, objects, color, label_fn=None):
     return result
 
 
+def draw_ranking(image, ranked, chosen=None, color=(0, 255, 255)):
+    """
+    Mark ranked candidates with their rank and the chosen one with a ring
+
+    Args:
+        image: BGR image to draw on (will be modified)
+        ranked: candidate dicts in rank order, best first
+        chosen: candidate the detector selected, or None
+        color: BGR color tuple
+
+    Returns:
+        Annotated image
+    """
+    result = image.copy()
+
+    for i, obj in enumerate(ranked):
+        cv2.putText(result, f"#{i+1}", (obj['center'][0] + 8, obj['center'][1] - 8),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
+
+    if chosen is not None:
+        cv2.circle(result, chosen['center'], 14, color, 2)
+
+    return result
+
+
 def draw_rejected_objects(image, objects, color, label_fn=None):
     """
     Draw rejected objects on image (thinner lines, no center marker)
@@ -0,0 +1,107 @@
+"""Frame-to-click latency tracking"""
+from collections import deque
+
+
+# Latency stages, in pipeline order
+STAGES = ('capture_to_detect', 'detect_to_input', 'input_to_click', 'total')
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a list of numbers
+
+    Args:
+        values: list of numbers
+        pct: percentile in [0, 100]
+
+    Returns:
+        percentile value, or None for an empty list
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class LatencyTracker:
+    """Records a latency breakdown for every input action"""
+
+    def __init__(self, max_records=1000):
+        """
+        Initialize tracker
+
+        Args:
+            max_records: number of most recent records kept
+        """
+        self.records = deque(maxlen=max_records)
+
+    def record(self, detection, input_start, click_time, reverified=False, clicked=True):
+        """
+        Record latency breakdown for one action
+
+        Args:
+            detection: Detection the action was based on
+            input_start: monotonic time the cursor movement started
+            click_time: monotonic time of the click (or of giving up)
+            reverified: whether the target was re-verified before clicking
+            clicked: whether the click was performed
+
+        Returns:
+            dict with timestamps and per-stage latencies (seconds)
+        """
+        record = {
+            'kind': detection.kind,
+            'captured_at': detection.captured_at,
+            'detected_at': detection.detected_at,
+            'input_start': input_start,
+            'click_time': click_time,
+            'capture_to_detect': detection.detected_at - detection.captured_at,
+            'detect_to_input': input_start - detection.detected_at,
+            'input_to_click': click_time - input_start,
+            'total': click_time - detection.captured_at,
+            'reverified': reverified,
+            'clicked': clicked
+        }
+        self.records.append(record)
+        return record
+
+    def clicked_records(self):
+        """Records of actions that ended in a click"""
+        return [r for r in self.records if r['clicked']]
+
+    def skipped_count(self):
+        """Number of recorded actions skipped because the target was gone"""
+        return sum(1 for r in self.records if not r['clicked'])
+
+    def summary(self):
+        """
+        Summarize recorded latencies of actions that ended in a click
+
+        Skipped actions have no click, so they are left out of every stage;
+        see skipped_count().
+
+        Returns:
+            dict of stage -> dict with mean, p50, p95 and max (seconds)
+        """
+        records = self.clicked_records()
+        result = {}
+        for stage in STAGES:
+            values = [r[stage] for r in records]
+            if not values:
+                continue
+            result[stage] = {
+                'mean': sum(values) / len(values),
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'max': max(values)
+            }
+        return result
+
+
+def format_record(record):
+    """Format a latency record as a single log line (milliseconds)"""
+    return (f"Latency: capture->detect {record['capture_to_detect'] * 1000:.0f}ms, "
+            f"detect->input {record['detect_to_input'] * 1000:.0f}ms, "
+            f"input->click {record['input_to_click'] * 1000:.0f}ms "
+            f"(total {record['total'] * 1000:.0f}ms)")
@@ -0,0 +1,270 @@
+"""Live debug preview over HTTP (MJPEG streams and a candidate table)"""
+import json
+import threading
+import time
+import cv2
+from config import PreviewConfig
+
+
+_server = None
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<title>Divination bot preview</title>
+<style>
+body { font-family: sans-serif; background: #222; color: #ddd; }
+.kind { display: inline-block; vertical-align: top; margin: 8px; }
+img { border: 1px solid #555; margin-right: 4px; }
+table { border-collapse: collapse; font-size: 12px; margin-top: 4px; }
+td, th { border: 1px solid #555; padding: 2px 6px; }
+</style>
+</head>
+<body>
+<div class="kind"><h3>Wisps</h3>
+<img src="/stream/wisp/annotated"><img src="/stream/wisp/mask">
+<table id="wisp"></table></div>
+<div class="kind"><h3>Energy rift</h3>
+<img src="/stream/rift/annotated"><img src="/stream/rift/mask">
+<table id="rift"></table></div>
+<script>
+const columns = ['status', 'rank', 'center', 'area', 'circularity', 'hue', 'value', 'cost', 'reason'];
+function refresh(kind) {
+  fetch('/candidates/' + kind).then(r => r.json()).then(data => {
+    const rows = (data.candidates || []).map(c => '<tr>' + columns.map(k => '<td>' + (c[k] ?? '') + '</td>').join('') + '</tr>');
+    document.getElementById(kind).innerHTML =
+      '<tr><th>frame ' + (data.frame_id ?? '-') + '</th>' + columns.slice(1).map(k => '<th>' + k + '</th>').join('') + '</tr>' + rows.join('');
+  }).catch(() => {});
+}
+setInterval(() => { refresh('wisp'); refresh('rift'); }, 1000);
+</script>
+</body>
+</html>
+"""
+
+
+def _candidate_row(candidate, status, rank=None):
+    """JSON-friendly summary of a candidate dict"""
+    row = {'status': status, 'center': list(candidate['center'])}
+    if rank is not None:
+        row['rank'] = rank
+    for key in ('area', 'circularity', 'hue', 'value', 'cost'):
+        if key in candidate:
+            row[key] = round(float(candidate[key]), 2)
+    if candidate.get('reason'):
+        row['reason'] = candidate['reason']
+    return row
+
+
+class PreviewServer:
+    """
+    HTTP server streaming annotated frames while clients are connected
+
+    Detectors publish references to their latest frame, mask and
+    candidates; nothing is drawn or encoded until a stream asks for it,
+    and each view is rendered at most MAX_FPS times per second no matter
+    how many clients watch.
+    """
+
+    def __init__(self, host=None, port=None):
+        self.address = (host or PreviewConfig.HOST, PreviewConfig.PORT if port is None else port)
+        self.condition = threading.Condition()
+        self.snapshots = {}
+        self.encoded = {}
+        self.clients = 0
+        self.sequence = 0
+        self.httpd = None
+        self.thread = None
+
+    def publish(self, kind, detector):
+        """
+        Store references to a detector's latest results
+
+        Cheap when nobody is watching: returns before touching any image.
+        """
+        if not self.clients:
+            return
+
+        frame_id = detector.last_frame.frame_id if detector.last_frame is not None else None
+        snapshot = {
+            'frame_id': frame_id,
+            'image': detector.last_bgr_image,
+            'mask': detector.last_mask,
+            'candidates': list(detector.candidates),
+            'rejected': list(detector.rejected),
+            'ranked': list(detector.ranked),
+            'chosen': detector.chosen,
+            'render': detector._render_debug_image
+        }
+        with self.condition:
+            self.sequence += 1
+            snapshot['sequence'] = self.sequence
+            self.snapshots[kind] = snapshot
+            self.condition.notify_all()
+
+    def _encode(self, kind, view):
+        """
+        Render and JPEG-encode the latest snapshot for a view
+
+        Returns:
+            tuple of (sequence, JPEG bytes), or None if nothing was published
+        """
+        with self.condition:
+            snapshot = self.snapshots.get(kind)
+            cached = self.encoded.get((kind, view))
+        if snapshot is None:
+            return None
+        if cached is not None and cached[0] == snapshot['sequence']:
+            return cached
+
+        if view == 'mask':
+            image = snapshot['mask']
+        else:
+            image = snapshot['render'](snapshot['image'], snapshot['candidates'], snapshot['rejected'],
+                                       snapshot['ranked'], snapshot['chosen'])
+
+        ok, data = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, PreviewConfig.JPEG_QUALITY])
+        if not ok:
+            return None
+
+        result = (snapshot['sequence'], data.tobytes())
+        with self.condition:
+            self.encoded[(kind, view)] = result
+        return result
+
+    def _candidates(self, kind):
+        """Candidate table for the latest snapshot of a kind"""
+        with self.condition:
+            snapshot = self.snapshots.get(kind)
+        if snapshot is None:
+            return {'frame_id': None, 'candidates': []}
+
+        # Chosen target first, then the rest of the ranking, then other candidates
+        ranks = {id(c): i + 1 for i, c in enumerate(snapshot['ranked'])}
+        accepted = sorted(snapshot['candidates'],
+                          key=lambda c: (c is not snapshot['chosen'], ranks.get(id(c), len(ranks) + 1)))
+        rows = [_candidate_row(c, 'chosen' if c is snapshot['chosen'] else 'accepted', ranks.get(id(c)))
+                for c in accepted]
+        rows += [_candidate_row(c, 'rejected') for c in snapshot['rejected']]
+        return {'frame_id': snapshot['frame_id'], 'candidates': rows}
+
+    def stream(self, kind, view, write):
+        """
+        Write MJPEG parts to a client until it disconnects
+
+        Args:
+            kind: detection type ('wisp', 'rift')
+            view: 'annotated' or 'mask'
+            write: callable writing bytes to the client
+        """
+        interval = 1.0 / PreviewConfig.MAX_FPS
+        last_sequence = None
+
+        with self.condition:
+            self.clients += 1
+        try:
+            while self.httpd is not None:
+                started = time.monotonic()
+
+                # Wait for a newer snapshot than the last one sent
+                with self.condition:
+                    self.condition.wait_for(
+                        lambda: self.snapshots.get(kind, {}).get('sequence') != last_sequence,
+                        timeout=1.0
+                    )
+
+                encoded = self._encode(kind, view)
+                if encoded is not None and encoded[0] != last_sequence:
+                    last_sequence, data = encoded
+                    write(b'--frame\r\nContent-Type: image/jpeg\r\n'
+                          + f'Content-Length: {len(data)}\r\n\r\n'.encode() + data + b'\r\n')
+
+                remaining = interval - (time.monotonic() - started)
+                if remaining > 0:
+                    time.sleep(remaining)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self.condition:
+                self.clients -= 1
+
+    def _make_handler(self):
+        """Build request handler class bound to this server"""
+        # http.server pulls in email/ssl; only pay for it when serving
+        from http.server import BaseHTTPRequestHandler
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, content_type, body):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parts = self.path.strip('/').split('/')
+
+                if self.path == '/':
+                    self._send('text/html; charset=utf-8', PAGE.encode())
+                elif len(parts) == 2 and parts[0] == 'candidates':
+                    self._send('application/json', json.dumps(server._candidates(parts[1])).encode())
+                elif len(parts) == 3 and parts[0] == 'stream' and parts[2] in ('annotated', 'mask'):
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=frame')
+                    self.send_header('Cache-Control', 'no-store')
+                    self.end_headers()
+                    server.stream(parts[1], parts[2], self.wfile.write)
+                else:
+                    self.send_error(404)
+
+        return Handler
+
+    def start(self):
+        """Start serving on a background thread"""
+        from http.server import ThreadingHTTPServer
+
+        self.httpd = ThreadingHTTPServer(self.address, self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='preview', daemon=True)
+        self.thread.start()
+        host, port = self.httpd.server_address[:2]
+        print(f"Live preview at http://{host}:{port}/")
+
+    def stop(self):
+        """Stop serving and release streaming clients"""
+        if self.httpd is None:
+            return
+        httpd, self.httpd = self.httpd, None
+        with self.condition:
+            self.condition.notify_all()
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def start_preview_server(host=None, port=None):
+    """Start the global preview server that detectors publish to"""
+    global _server
+    if _server is None:
+        _server = PreviewServer(host, port)
+        _server.start()
+    return _server
+
+
+def stop_preview_server():
+    """Stop the global preview server"""
+    global _server
+    if _server is not None:
+        _server.stop()
+        _server = None
+
+
+def publish_preview(kind, detector):
+    """Publish detector results to the preview server, if one is running"""
+    if _server is not None:
+        _server.publish(kind, detector)
@@ -0,0 +1,187 @@
+"""Startup time budget check
+
+Imports each entry point in a fresh interpreter with -X importtime, runs
+its initializer, and reports import and initialization time per module.
+Fails if an entry point exceeds its budget or loads a forbidden module
+(e.g. pyautogui, which needs a display).
+
+The bot entry point is measured up to its first detection with a warm
+window cache, against the simulated game so no display is needed.
+
+Usage:
+    python -m utils.startup_check
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from config import ScreenConfig, SimulatorConfig, StartupConfig, WindowLocatorConfig
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Top-level modules and packages of this project
+PROJECT_MODULES = {
+    name[:-3] if name.endswith('.py') else name
+    for name in os.listdir(ROOT)
+    if name.endswith('.py') or os.path.exists(os.path.join(ROOT, name, '__init__.py'))
+}
+
+# Runs inside the child interpreter:
+# argv = [module, setup, initializer, forbidden JSON]; setup is not timed
+PROBE = """
+import importlib, json, sys, time
+def call(spec):
+    if spec:
+        module_name, attribute = spec.split(':')
+        getattr(importlib.import_module(module_name), attribute)()
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+call(sys.argv[2])
+initialized = time.perf_counter()
+call(sys.argv[3])
+done = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'init': done - initialized,
+    'forbidden': [name for name in json.loads(sys.argv[4]) if name in sys.modules]
+}))
+"""
+
+# Keeps the warm window cache of prepare_window_cache() until the child exits
+_cache_dir = None
+
+
+def prepare_window_cache():
+    """
+    Setup for the bot entry point: simulated screen and a warm window cache
+
+    Installs the simulator backends and writes a cache entry whose anchor
+    matches the simulated viewport, in a temporary file so the real cache
+    is left alone.
+    """
+    global _cache_dir
+    # utils does not otherwise depend on the simulator
+    import backends
+    from backends.clock import VirtualClock
+    from simulator.backend import SimulatedInputBackend
+    from simulator.scene import SimulatedGame
+    from utils.window_locator import WindowLocator, _anchor_pixels
+    from utils.image_processor import capture_bgr, get_screen_size
+
+    clock = VirtualClock()
+    backends.set_input_backend(SimulatedInputBackend(SimulatedGame(SimulatorConfig.SEED), clock))
+    backends.set_clock(clock)
+
+    _cache_dir = tempfile.TemporaryDirectory()
+    WindowLocatorConfig.CACHE_FILE = os.path.join(_cache_dir.name, 'window_cache.json')
+
+    x, y, width, height = ScreenConfig.get_region()
+    size = WindowLocatorConfig.ANCHOR_SIZE
+    locator = WindowLocator()
+    locator.screen_key = "{}x{}".format(*get_screen_size())
+    locator._save_cache({
+        'region': [x, y, width, height],
+        'anchor': {'x': x, 'y': y, 'pixels': _anchor_pixels(capture_bgr((x, y, size, size))).tolist()}
+    })
+
+
+def first_detection_from_cache():
+    """Bot initializer: build the bot, locate the window from the cache, detect once"""
+    from controllers.bot import BotController
+
+    bot = BotController()
+    if not bot.window_locator.locate():
+        raise RuntimeError("Window cache was not hit")
+    bot.wisp_detector.detect()
+
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output
+
+    Returns:
+        list of (module, self seconds, cumulative seconds)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace('import time:', '|').split('|')]
+        entries.append((name, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return entries
+
+
+def measure(module, setup=None, initializer=None):
+    """
+    Measure one entry point in a fresh interpreter
+
+    Args:
+        module: module to import
+        setup: 'module:callable' run after the import and not timed, or None
+        initializer: 'module:callable' called with no arguments, or None
+
+    Returns:
+        dict with import, init, process (wall time including interpreter
+        startup) in seconds, forbidden modules loaded, and importtime entries
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE, module, setup or '', initializer or '',
+         json.dumps(list(StartupConfig.FORBIDDEN_MODULES))],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    process_time = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.splitlines()[-1] if result.stderr else ''}")
+
+    # Initializers may print; the probe result is the last line
+    measurement = json.loads(result.stdout.strip().splitlines()[-1])
+    measurement['process'] = process_time
+    measurement['modules'] = parse_importtime(result.stderr)
+    return measurement
+
+
+def check_entry_point(name, module, setup, initializer, budget):
+    """
+    Measure an entry point RUNS times and check it against its budget
+
+    Returns:
+        list of failure messages (empty if within budget)
+    """
+    runs = [measure(module, setup, initializer) for _ in range(StartupConfig.RUNS)]
+    best = min(runs, key=lambda run: run['import'] + run['init'])
+    total = best['import'] + best['init']
+
+    print(f"{name} ({module}): import {best['import'] * 1000:.0f}ms, "
+          f"init {best['init'] * 1000:.0f}ms, process {best['process'] * 1000:.0f}ms "
+          f"(budget {budget * 1000:.0f}ms)")
+    # Report project modules and top-level third-party packages only
+    modules = [m for m in best['modules'] if '.' not in m[0] or m[0].split('.')[0] in PROJECT_MODULES]
+    for module_name, self_time, cumulative in sorted(modules, key=lambda m: -m[2])[:StartupConfig.REPORT_TOP]:
+        print(f"    {cumulative * 1000:7.1f}ms cumulative {self_time * 1000:6.1f}ms self  {module_name}")
+
+    failures = []
+    if total > budget:
+        failures.append(f"{name}: startup {total * 1000:.0f}ms exceeds budget {budget * 1000:.0f}ms")
+    if best['forbidden']:
+        failures.append(f"{name}: loads {', '.join(best['forbidden'])} at startup")
+    return failures
+
+
+def main():
+    failures = []
+    for name, (module, setup, initializer, budget) in StartupConfig.ENTRY_POINTS.items():
+        failures += check_entry_point(name, module, setup, initializer, budget)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
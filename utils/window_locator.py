@@ -0,0 +1,302 @@
+"""Game window localization and region caching"""
+import json
+import os
+import cv2
+import numpy as np
+from utils.image_processor import capture_bgr, get_screen_size
+from backends import get_clock
+from config import ScreenConfig, WindowLocatorConfig
+
+
+def _prepare(image):
+    """Convert image to the representation used for matching"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    if WindowLocatorConfig.USE_EDGES:
+        low, high = WindowLocatorConfig.CANNY_THRESHOLDS
+        return cv2.Canny(gray, low, high)
+    return gray
+
+
+def match_template_multiscale(screen_bgr, template_bgr, scales):
+    """
+    Find template in screen image across several scales
+
+    Searches a downscaled copy of the screen first, then refines the best
+    REFINE_CANDIDATES coarse matches at full resolution in a small window
+    around each and keeps the best refined score. TM_CCOEFF_NORMED reports
+    a flat template (e.g. no Canny edges left after shrinking) as a perfect
+    match, so a scale whose downscaled template is flat is searched at full
+    resolution instead, and one that is flat even there is skipped.
+
+    Args:
+        screen_bgr: full screen BGR image
+        template_bgr: template BGR image
+        scales: iterable of template scale factors
+
+    Returns:
+        tuple of (score, (x, y), scale) in screen image pixels, or None
+    """
+    screen = _prepare(screen_bgr)
+    downscale = WindowLocatorConfig.SEARCH_DOWNSCALE
+    small_screen = cv2.resize(screen_bgr, None, fx=downscale, fy=downscale,
+                              interpolation=cv2.INTER_AREA)
+    small_screen = _prepare(small_screen)
+
+    # Coarse search over all scales
+    coarse = []
+    full = []
+    for scale in scales:
+        factor = scale * downscale
+        template = cv2.resize(template_bgr, None, fx=factor, fy=factor,
+                              interpolation=cv2.INTER_AREA)
+        template = _prepare(template)
+        t_h, t_w = template.shape[:2]
+        if t_h < 4 or t_w < 4 or t_h > small_screen.shape[0] or t_w > small_screen.shape[1]:
+            continue
+        if template.std() == 0:
+            match = _match_full(screen, template_bgr, scale)
+            if match is not None:
+                full.append(match)
+            continue
+
+        result = cv2.matchTemplate(small_screen, template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, location = cv2.minMaxLoc(result)
+        coarse.append((score, location, scale))
+
+    # Refine the best coarse matches at full resolution
+    best = max(full, key=lambda match: match[0]) if full else None
+    coarse.sort(key=lambda match: match[0], reverse=True)
+    for match in coarse[:WindowLocatorConfig.REFINE_CANDIDATES]:
+        refined = _refine(screen, template_bgr, match, downscale)
+        if refined is not None and (best is None or refined[0] > best[0]):
+            best = refined
+    return best
+
+
+def _match_full(screen, template_bgr, scale):
+    """
+    Match a template against the whole full resolution screen
+
+    Returns:
+        tuple of (score, (x, y), scale), or None if the template has no
+        features at this scale or does not fit the screen
+    """
+    template = _prepare(cv2.resize(template_bgr, None, fx=scale, fy=scale,
+                                   interpolation=cv2.INTER_AREA))
+    t_h, t_w = template.shape[:2]
+    if template.std() == 0 or t_h > screen.shape[0] or t_w > screen.shape[1]:
+        return None
+
+    result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+    _, score, _, location = cv2.minMaxLoc(result)
+    return score, location, scale
+
+
+def _refine(screen, template_bgr, match, downscale):
+    """
+    Re-match a coarse match at full resolution in a small window around it
+
+    Args:
+        screen: full resolution screen in matching representation
+        template_bgr: template BGR image
+        match: coarse (score, (x, y), scale) in downscaled pixels
+        downscale: factor the coarse search screen was resized by
+
+    Returns:
+        tuple of (score, (x, y), scale) in screen image pixels, or None if
+        the template has no features at this scale
+    """
+    coarse_score, (coarse_x, coarse_y), scale = match
+    template = _prepare(cv2.resize(template_bgr, None, fx=scale, fy=scale,
+                                   interpolation=cv2.INTER_AREA))
+    if template.std() == 0:
+        return None
+
+    t_h, t_w = template.shape[:2]
+    margin = WindowLocatorConfig.REFINE_MARGIN
+    x0 = max(int(coarse_x / downscale) - margin, 0)
+    y0 = max(int(coarse_y / downscale) - margin, 0)
+    x1 = min(x0 + t_w + 2 * margin, screen.shape[1])
+    y1 = min(y0 + t_h + 2 * margin, screen.shape[0])
+    window = screen[y0:y1, x0:x1]
+    if window.shape[0] < t_h or window.shape[1] < t_w:
+        return coarse_score, (int(coarse_x / downscale), int(coarse_y / downscale)), scale
+
+    result = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+    _, score, _, (x, y) = cv2.minMaxLoc(result)
+    return score, (x0 + x, y0 + y), scale
+
+
+def _anchor_pixels(image):
+    """Reduce an anchor capture to a small grayscale patch"""
+    size = WindowLocatorConfig.ANCHOR_SIZE
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA)
+
+
+class WindowLocator:
+    """Locates the game viewport on screen and keeps ScreenConfig in sync"""
+
+    def __init__(self):
+        self.base_size = (ScreenConfig.REGION_WIDTH, ScreenConfig.REGION_HEIGHT)
+        self.anchor = None
+        self.screen_key = None
+        self.template_missing = False
+        self.next_check_at = None
+        self.retry_delay = None
+
+    def _load_cache(self):
+        """Load cache file contents, or an empty dict"""
+        if not os.path.exists(WindowLocatorConfig.CACHE_FILE):
+            return {}
+        try:
+            with open(WindowLocatorConfig.CACHE_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, entry):
+        """Store located region for the current screen resolution"""
+        cache = self._load_cache()
+        cache[self.screen_key] = entry
+        with open(WindowLocatorConfig.CACHE_FILE, 'w') as f:
+            json.dump(cache, f, indent=2)
+
+    def _anchor_matches(self, anchor):
+        """Check the cached anchor pixels against the current screen"""
+        size = WindowLocatorConfig.ANCHOR_SIZE
+        current = _anchor_pixels(capture_bgr((anchor['x'], anchor['y'], size, size)))
+        expected = np.array(anchor['pixels'], dtype=np.uint8)
+        diff = cv2.absdiff(current, expected)
+        return float(diff.mean()) <= WindowLocatorConfig.ANCHOR_TOLERANCE
+
+    def _search(self):
+        """
+        Search the full screen for the game viewport
+
+        Returns:
+            cache entry dict, or None if the viewport was not found
+        """
+        template = cv2.imread(WindowLocatorConfig.TEMPLATE_PATH)
+        if template is None:
+            print(f"Window template not found at {WindowLocatorConfig.TEMPLATE_PATH}, using configured region")
+            self.template_missing = True
+            return None
+
+        screen = capture_bgr()
+        screen_width, _ = get_screen_size()
+
+        # Screenshots may be in physical pixels (e.g. Retina displays)
+        pixel_ratio = screen.shape[1] / screen_width
+
+        match = match_template_multiscale(screen, template, WindowLocatorConfig.SCALES)
+        if match is None or match[0] < WindowLocatorConfig.MATCH_THRESHOLD:
+            score = match[0] if match else 0.0
+            fallback = "keeping last known region" if self.anchor is not None else "using configured region"
+            print(f"Game window not found (best score {score:.2f}), {fallback}")
+            return None
+
+        score, (match_x, match_y), scale = match
+        offset_x, offset_y = WindowLocatorConfig.REGION_OFFSET
+        base_width, base_height = self.base_size
+        x = int(round(match_x / pixel_ratio + offset_x * scale))
+        y = int(round(match_y / pixel_ratio + offset_y * scale))
+        anchor_x = int(round(match_x / pixel_ratio))
+        anchor_y = int(round(match_y / pixel_ratio))
+
+        # Anchor is taken from the same screenshot used for the search
+        size = WindowLocatorConfig.ANCHOR_SIZE
+        physical = int(round(size * pixel_ratio))
+        patch = screen[match_y:match_y + physical, match_x:match_x + physical]
+
+        print(f"Game window found at ({x}, {y}), scale {scale:.2f}, score {score:.2f}")
+        return {
+            'region': [x, y, int(round(base_width * scale)), int(round(base_height * scale))],
+            'anchor': {
+                'x': anchor_x,
+                'y': anchor_y,
+                'pixels': _anchor_pixels(patch).tolist()
+            }
+        }
+
+    def _apply(self, entry):
+        """Apply a cache entry to ScreenConfig"""
+        ScreenConfig.set_region(*entry['region'])
+        self.anchor = entry['anchor']
+
+    def _schedule_retry(self):
+        """Schedule the next search after a failure, backing off exponentially"""
+        if self.template_missing:
+            # Nothing to search for; keep the configured region for the whole run
+            self.next_check_at = None
+            return
+
+        if self.retry_delay is None:
+            self.retry_delay = WindowLocatorConfig.RETRY_INITIAL_DELAY
+        else:
+            self.retry_delay = min(self.retry_delay * 2, WindowLocatorConfig.RETRY_MAX_DELAY)
+
+        self.next_check_at = get_clock().monotonic() + self.retry_delay
+        print(f"Searching again in {self.retry_delay:.0f}s")
+
+    def _schedule_check(self):
+        """Schedule the next anchor check after a successful locate or check"""
+        self.retry_delay = None
+        self.next_check_at = get_clock().monotonic() + WindowLocatorConfig.REVALIDATE_INTERVAL
+
+    def locate(self):
+        """
+        Locate the game viewport, using the cache when it is still valid
+
+        On failure the last known region and anchor are kept and the search
+        is retried from tick() with exponential backoff.
+
+        Returns:
+            True if the region was located (cached or searched)
+        """
+        if not WindowLocatorConfig.ENABLED:
+            return False
+
+        width, height = get_screen_size()
+        self.screen_key = f"{width}x{height}"
+
+        cached = self._load_cache().get(self.screen_key)
+        if cached and self._anchor_matches(cached['anchor']):
+            self._apply(cached)
+            self._schedule_check()
+            print(f"Using cached game window region {tuple(cached['region'])}")
+            return True
+
+        entry = self._search()
+        if entry is None:
+            self._schedule_retry()
+            return False
+
+        self._apply(entry)
+        self._save_cache(entry)
+        self._schedule_check()
+        return True
+
+    def tick(self):
+        """
+        Re-validate the located region once REVALIDATE_INTERVAL has passed
+
+        Cheap to call before every detection: between checks it only reads
+        the clock. Re-runs the full search only when the anchor check fails,
+        and keeps retrying (with backoff) until the window is found again.
+        """
+        if not WindowLocatorConfig.ENABLED or self.next_check_at is None:
+            return
+
+        if get_clock().monotonic() < self.next_check_at:
+            return
+
+        if self.anchor is not None and self._anchor_matches(self.anchor):
+            if self.retry_delay is not None:
+                print("Game window is back at its last known position")
+            self._schedule_check()
+            return
+
+        if self.retry_delay is None:
+            print("Game window moved, searching again...")
+        self.locate()